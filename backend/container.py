@@ -0,0 +1,313 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+from .services.cache import TTLCache
+from .services.document_cache import WatchedDocument
+from .services.project_service import ProjectService
+from .services.personal_info_service import PersonalInfoService
+from .services.contact_service import ContactService
+from .services.skill_service import SkillService
+from .services.portfolio_service import PortfolioService
+from .services.contact_ingest import ContactIngestQueue
+from .services.contact_stats import ContactCounters
+from .services.spam_filter import SpamFilter
+from .services.contact_retention import ContactRetention
+from .services.notifications import NotificationDispatcher, NotificationTarget, SmtpTarget, WebhookTarget
+from .services.search_index import ProjectSearchIndex
+from .services.facet_index import TechnologyFacetIndex
+from .services.image_pipeline import ImagePipeline, derivative_dir
+from .services.media_store import MediaStore
+from .snapshot import Snapshot, SnapshotScheduler
+from .services.rate_limiter import MongoRateLimiter, TokenBucketLimiter, parse_rules
+from .models.personal_info import PersonalInfo
+from .utils.metrics import monitor_event_loop_lag, registry
+from .utils.compression import CompressedBodyCache
+from datetime import timedelta
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+
+class Container:
+    """Application-scoped services and caches, built once in ``lifespan``.
+
+    Request handlers receive these singletons through cheap dependencies
+    instead of constructing services per request.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.database = database
+
+        # Opt-in: serialize responses straight to bytes, skipping response_model revalidation
+        self.fast_json = os.environ.get('FAST_JSON_RESPONSES', 'false').lower() == 'true'
+
+        # Shared read-through cache for the project list endpoints
+        self.project_cache = TTLCache(
+            ttl=float(os.environ.get('PROJECT_CACHE_TTL_SECONDS', '30')),
+            maxsize=int(os.environ.get('PROJECT_CACHE_MAX_ENTRIES', '64'))
+        )
+
+        self.skill_cache = TTLCache(
+            ttl=float(os.environ.get('SKILL_CACHE_TTL_SECONDS', '30')),
+            maxsize=int(os.environ.get('SKILL_CACHE_MAX_ENTRIES', '8'))
+        )
+
+        # Assembled homepage responses, keyed by the versions of their parts
+        self.portfolio_cache = TTLCache(
+            ttl=float(os.environ.get('PORTFOLIO_CACHE_TTL_SECONDS', '300')),
+            maxsize=int(os.environ.get('PORTFOLIO_CACHE_MAX_ENTRIES', '4'))
+        )
+
+        # Compressed response bodies, reused while their ETag is unchanged
+        self.compressed_cache = CompressedBodyCache(
+            max_bytes=int(os.environ.get('COMPRESSION_CACHE_BYTES', str(32 * 1024 * 1024)))
+        )
+
+        # In-memory copy of the personal info singleton, refreshed when it changes
+        self.personal_info_cache = WatchedDocument(
+            PersonalInfo,
+            "personal_info",
+            "personal_info",
+            poll_interval=float(os.environ.get('PERSONAL_INFO_POLL_SECONDS', '5'))
+        )
+
+        # Ranked full-text search over projects, served from memory
+        self.project_search_index = ProjectSearchIndex()
+        # Technology tag counts and per-tag project ids
+        self.project_facet_index = TechnologyFacetIndex()
+        self.project_index_refresh_interval = float(os.environ.get('PROJECT_INDEX_REFRESH_SECONDS', '60'))
+
+        # Resized WebP / JPEG copies of project images, generated on create and update
+        self.image_pipeline: Optional[ImagePipeline] = None
+        if os.environ.get('IMAGE_PIPELINE_ENABLED', 'true').lower() == 'true':
+            self.image_pipeline = ImagePipeline(
+                source_dir=Path(os.environ.get('IMAGE_SOURCE_DIR', str(ROOT_DIR.parent / 'frontend' / 'public'))),
+                output_dir=derivative_dir(),
+                widths=[int(w) for w in os.environ.get('IMAGE_DERIVATIVE_WIDTHS', '320,640,1280').split(',')],
+                formats=[f.strip() for f in os.environ.get('IMAGE_DERIVATIVE_FORMATS', 'webp,jpeg').split(',')],
+                quality=int(os.environ.get('IMAGE_DERIVATIVE_QUALITY', '80')),
+                max_workers=int(os.environ.get('IMAGE_PIPELINE_WORKERS', '2'))
+            )
+
+        # Videos and documents streamed by /api/media, with a bounded set of open files
+        self.media_store = MediaStore(
+            Path(os.environ.get('MEDIA_ROOT', str(ROOT_DIR.parent / 'frontend' / 'public'))),
+            max_open_files=int(os.environ.get('MEDIA_MAX_OPEN_FILES', '64'))
+        )
+
+        self.project_service = ProjectService(
+            database,
+            cache=self.project_cache,
+            search_index=self.project_search_index,
+            facet_index=self.project_facet_index,
+            image_pipeline=self.image_pipeline
+        )
+        self.personal_info_service = PersonalInfoService(database, cache=self.personal_info_cache)
+        self.skill_service = SkillService(database, cache=self.skill_cache)
+        self.portfolio_service = PortfolioService(
+            self.personal_info_service,
+            self.project_service,
+            self.skill_service,
+            cache=self.portfolio_cache
+        )
+
+        # Maintained contact counts, recounted every CONTACT_STATS_RECONCILE_SECONDS
+        self.contact_counters = ContactCounters(database)
+        self.contact_stats_reconcile_interval = float(os.environ.get('CONTACT_STATS_RECONCILE_SECONDS', '3600'))
+
+        # Opt-in write-behind ingestion for contact form submissions
+        self.contact_ingest: Optional[ContactIngestQueue] = None
+        if os.environ.get('CONTACT_INGEST_MODE', 'sync').lower() == 'batched':
+            self.contact_ingest = ContactIngestQueue(
+                database.contacts,
+                spool_path=Path(os.environ.get('CONTACT_INGEST_SPOOL', str(ROOT_DIR / 'spool' / 'contacts.ndjson'))),
+                batch_size=int(os.environ.get('CONTACT_INGEST_BATCH_SIZE', '100')),
+                flush_interval=float(os.environ.get('CONTACT_INGEST_FLUSH_SECONDS', '0.5')),
+                max_queue=int(os.environ.get('CONTACT_INGEST_MAX_QUEUE', '10000')),
+                enqueue_timeout=float(os.environ.get('CONTACT_INGEST_ENQUEUE_TIMEOUT_SECONDS', '1')),
+                fsync=os.environ.get('CONTACT_INGEST_FSYNC', 'false').lower() == 'true',
+                counters=self.contact_counters
+            )
+
+        # Near-duplicate and spam screening of contact submissions, per worker
+        self.spam_filter: Optional[SpamFilter] = None
+        if os.environ.get('SPAM_FILTER_ENABLED', 'true').lower() == 'true':
+            self.spam_filter = SpamFilter(
+                max_messages=int(os.environ.get('SPAM_FILTER_MAX_MESSAGES', '10000')),
+                window=float(os.environ.get('SPAM_FILTER_WINDOW_SECONDS', '86400')),
+                flag_score=float(os.environ.get('SPAM_FILTER_FLAG_SCORE', '0.5')),
+                drop_score=float(os.environ.get('SPAM_FILTER_DROP_SCORE', '0.8'))
+            )
+
+        # New-contact notifications, delivered by background workers when a target is configured
+        self.notifier: Optional[NotificationDispatcher] = None
+        notification_targets = self._notification_targets()
+        if notification_targets:
+            self.notifier = NotificationDispatcher(
+                notification_targets,
+                database.notification_dead_letters,
+                workers=int(os.environ.get('NOTIFY_WORKERS', '2')),
+                digest_size=int(os.environ.get('NOTIFY_DIGEST_SIZE', '1')),
+                digest_window=float(os.environ.get('NOTIFY_DIGEST_SECONDS', '60')),
+                max_queue=int(os.environ.get('NOTIFY_MAX_QUEUE', '10000')),
+                max_attempts=int(os.environ.get('NOTIFY_MAX_ATTEMPTS', '5')),
+                retry_delay=float(os.environ.get('NOTIFY_RETRY_SECONDS', '1'))
+            )
+        self.contact_service = ContactService(
+            database,
+            ingest=self.contact_ingest,
+            counters=self.contact_counters,
+            spam_filter=self.spam_filter,
+            notifier=self.notifier
+        )
+
+        # Opt-in: read contacts older than CONTACT_ARCHIVE_AFTER_DAYS move to contacts_archive,
+        # and, only when CONTACT_COLD_DIR is set, on to compressed files after CONTACT_COLD_AFTER_DAYS
+        self.contact_retention: Optional[ContactRetention] = None
+        self.contact_retention_interval = float(os.environ.get('CONTACT_RETENTION_INTERVAL_SECONDS', '3600'))
+        archive_after_days = float(os.environ.get('CONTACT_ARCHIVE_AFTER_DAYS', '0'))
+        if archive_after_days > 0:
+            cold_dir = os.environ.get('CONTACT_COLD_DIR')
+            self.contact_retention = ContactRetention(
+                database,
+                cold_dir=Path(cold_dir) if cold_dir else None,
+                archive_after=timedelta(days=archive_after_days),
+                cold_after=timedelta(days=float(os.environ.get('CONTACT_COLD_AFTER_DAYS', '365'))),
+                grace=timedelta(days=float(os.environ.get('CONTACT_ARCHIVE_GRACE_DAYS', '7'))),
+                batch_size=int(os.environ.get('CONTACT_RETENTION_BATCH_SIZE', '500')),
+                zstd_level=int(os.environ.get('CONTACT_COLD_ZSTD_LEVEL', '10')),
+                counters=self.contact_counters
+            )
+
+        # Per-route request limits, enforced by RateLimitMiddleware
+        self.rate_limit_rules = parse_rules(os.environ.get(
+            'RATE_LIMITS',
+            '{"POST /api/contacts": {"ip": "5/60", "email": "3/3600"}}'
+        ))
+        if os.environ.get('RATE_LIMIT_BACKEND', 'memory').lower() == 'mongo':
+            # Shared by all workers; in-memory buckets are per process
+            self.rate_limiter = MongoRateLimiter(database.rate_limits)
+        else:
+            self.rate_limiter = TokenBucketLimiter(max_keys=int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000')))
+
+        # Opt-in: keep a static JSON snapshot of the read API up to date after writes
+        self.snapshot_scheduler: Optional[SnapshotScheduler] = None
+        snapshot_dir = os.environ.get('SNAPSHOT_DIR')
+        if snapshot_dir:
+            self.snapshot_scheduler = SnapshotScheduler(
+                Snapshot(
+                    Path(snapshot_dir),
+                    self.project_service,
+                    self.personal_info_service,
+                    self.skill_service,
+                    self.portfolio_service
+                ),
+                stamp=lambda: (
+                    self.project_cache.version,
+                    self.skill_cache.version,
+                    self.personal_info_cache.stats()["version"]
+                ),
+                interval=float(os.environ.get('SNAPSHOT_INTERVAL_SECONDS', '5'))
+            )
+
+        self._loop_lag_task: Optional[asyncio.Task] = None
+        self._index_refresh_task: Optional[asyncio.Task] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._retention_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.image_pipeline:
+            self.image_pipeline.start()
+        await self.personal_info_cache.start(self.database)
+        await self.project_service.refresh_indexes()
+        if self.project_index_refresh_interval > 0:
+            self._index_refresh_task = asyncio.create_task(self._refresh_project_indexes())
+        if self.contact_ingest:
+            await self.contact_ingest.start()
+        if self.notifier:
+            self.notifier.start()
+        if self.contact_stats_reconcile_interval > 0:
+            self._reconcile_task = asyncio.create_task(self._reconcile_contact_counters())
+        if self.contact_retention and self.contact_retention_interval > 0:
+            self._retention_task = asyncio.create_task(self._apply_contact_retention())
+        if self.snapshot_scheduler:
+            self.snapshot_scheduler.start()
+        self._loop_lag_task = asyncio.create_task(monitor_event_loop_lag(
+            registry.gauge("event_loop_lag_seconds", "Delay of the event loop waking from a timed sleep")
+        ))
+
+    async def stop(self) -> None:
+        if self.snapshot_scheduler:
+            await self.snapshot_scheduler.stop()
+        if self._loop_lag_task:
+            self._loop_lag_task.cancel()
+        if self._index_refresh_task:
+            self._index_refresh_task.cancel()
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+        if self._retention_task:
+            self._retention_task.cancel()
+        if self.contact_ingest:
+            # Drain queued submissions while the database connection is still open
+            await self.contact_ingest.stop()
+        if self.notifier:
+            await self.notifier.stop()
+        await self.personal_info_cache.stop()
+        if self.image_pipeline:
+            await self.image_pipeline.stop()
+        self.media_store.close()
+
+    def _notification_targets(self) -> List[NotificationTarget]:
+        targets: List[NotificationTarget] = []
+        webhook_url = os.environ.get('NOTIFY_WEBHOOK_URL')
+        if webhook_url:
+            targets.append(WebhookTarget(
+                webhook_url,
+                timeout=float(os.environ.get('NOTIFY_TIMEOUT_SECONDS', '10'))
+            ))
+        smtp_host = os.environ.get('NOTIFY_SMTP_HOST')
+        if smtp_host:
+            targets.append(SmtpTarget(
+                smtp_host,
+                sender=os.environ.get('NOTIFY_SMTP_FROM', 'portfolio@localhost'),
+                recipients=[r.strip() for r in os.environ.get('NOTIFY_SMTP_TO', '').split(',') if r.strip()],
+                port=int(os.environ.get('NOTIFY_SMTP_PORT', '25')),
+                username=os.environ.get('NOTIFY_SMTP_USERNAME'),
+                password=os.environ.get('NOTIFY_SMTP_PASSWORD'),
+                starttls=os.environ.get('NOTIFY_SMTP_STARTTLS', 'false').lower() == 'true',
+                timeout=float(os.environ.get('NOTIFY_TIMEOUT_SECONDS', '10'))
+            ))
+        return targets
+
+    async def _refresh_project_indexes(self) -> None:
+        """Pick up project writes made by other workers."""
+        while True:
+            await asyncio.sleep(self.project_index_refresh_interval)
+            try:
+                await self.project_service.refresh_indexes()
+            except PyMongoError as e:
+                logger.warning("Refreshing project indexes failed: %s", e)
+
+    async def _reconcile_contact_counters(self) -> None:
+        """Recount contacts at startup and then periodically, correcting any drift."""
+        while True:
+            try:
+                await self.contact_counters.reconcile()
+            except PyMongoError as e:
+                logger.warning("Reconciling contact counters failed: %s", e)
+            await asyncio.sleep(self.contact_stats_reconcile_interval)
+
+    async def _apply_contact_retention(self) -> None:
+        """Move old contacts to the archive and cold files, then sleep until the next run."""
+        while True:
+            try:
+                result = await self.contact_retention.run()
+                if result["archived"] or result["exported"]:
+                    logger.info("Contact retention: %(archived)d archived, %(exported)d exported", result)
+            except (PyMongoError, OSError) as e:
+                logger.warning("Contact retention failed: %s", e)
+            await asyncio.sleep(self.contact_retention_interval)
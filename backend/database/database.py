@@ -1,34 +1,83 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from .indexes import ensure_indexes
+from .monitoring import CommandMetrics
+import asyncio
+import importlib.util
 import os
 
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
+    index_task: Optional[asyncio.Task] = None
 
 db = Database()
 
+# Times every command sent through the client, exposed on /metrics
+command_metrics = CommandMetrics()
+
 async def get_database():
     return db.database
 
+# Wire compressors and the Python module each one needs
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+def _available_compressors(requested: str) -> List[str]:
+    """Keep the requested compressors whose Python module is installed."""
+    available = []
+    for name in (c.strip() for c in requested.split(",")):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            available.append(name)
+    return available
+
+def client_options() -> Dict[str, Any]:
+    """Build connection pool and timeout settings for the Motor client from the environment."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+        "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', '10')),
+        "maxIdleTimeMS": int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000')),
+        "connectTimeoutMS": int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+        "serverSelectionTimeoutMS": int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+        "waitQueueTimeoutMS": int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000')),
+        "event_listeners": [command_metrics],
+    }
+    socket_timeout = os.environ.get('MONGO_SOCKET_TIMEOUT_MS')
+    if socket_timeout:
+        options["socketTimeoutMS"] = int(socket_timeout)
+    compressors = _available_compressors(os.environ.get('MONGO_COMPRESSORS', 'zstd,snappy,zlib'))
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
 async def connect_to_mongo():
     """Create database connection"""
     mongo_url = os.environ.get('MONGO_URL')
     db_name = os.environ.get('DB_NAME', 'portfolio')
     
-    db.client = AsyncIOMotorClient(mongo_url)
+    db.client = AsyncIOMotorClient(mongo_url, **client_options())
     db.database = db.client[db_name]
     
+    # Open a connection now so the first request does not pay for the handshake;
+    # the driver keeps minPoolSize connections warm from here on
+    await db.client.admin.command("ping")
+    
     # Create collections if they don't exist
     await db.database.create_collection("projects", check_exists=False)
     await db.database.create_collection("personal_info", check_exists=False)
     await db.database.create_collection("contacts", check_exists=False)
     await db.database.create_collection("skills", check_exists=False)
     
+    # Build indexes in the background so startup is not blocked by large collections
+    drop_stale = os.environ.get('MONGO_DROP_STALE_INDEXES', 'false').lower() == 'true'
+    db.index_task = asyncio.create_task(ensure_indexes(db.database, drop_stale=drop_stale))
+    
     print("Connected to MongoDB")
 
 async def close_mongo_connection():
     """Close database connection"""
+    if db.index_task and not db.index_task.done():
+        db.index_task.cancel()
     if db.client:
         db.client.close()
         print("Disconnected from MongoDB")
\ No newline at end of file
@@ -0,0 +1,81 @@
+from typing import Dict, List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Collection name -> indexes declared by the service that owns it
+index_registry: Dict[str, List[IndexModel]] = {}
+
+def register_indexes(collection_name: str, indexes: List[IndexModel]) -> None:
+    """Declare the indexes a collection needs. Called by each service module."""
+    declared = index_registry.setdefault(collection_name, [])
+    names = {index.document["name"] for index in declared}
+    declared.extend(index for index in indexes if index.document["name"] not in names)
+
+async def ensure_indexes(database: AsyncIOMotorDatabase, drop_stale: bool = False) -> None:
+    """Reconcile the indexes in ``database`` with ``index_registry``.
+
+    Missing indexes are created and indexes whose key or options changed are
+    rebuilt when ``drop_stale`` is set. Indexes that are no longer declared are
+    logged, and dropped only when ``drop_stale`` is set. A failure on one index
+    (for example duplicate values under a new unique index) is logged and does
+    not stop the others.
+    """
+    for collection_name, indexes in index_registry.items():
+        collection = database[collection_name]
+        try:
+            existing = await collection.index_information()
+        except PyMongoError as e:
+            logger.error("Could not list indexes on %s: %s", collection_name, e)
+            continue
+
+        declared = {index.document["name"]: index for index in indexes}
+
+        for name, info in existing.items():
+            if name == "_id_" or name in declared:
+                continue
+            if drop_stale:
+                logger.info("Dropping stale index %s.%s", collection_name, name)
+                await _drop_index(collection, name)
+            else:
+                logger.warning("Index %s.%s is not declared by any service", collection_name, name)
+
+        to_create = []
+        for name, index in declared.items():
+            info = existing.get(name)
+            if info is None:
+                to_create.append(index)
+            elif not _matches(index.document, info):
+                if drop_stale:
+                    logger.info("Rebuilding changed index %s.%s", collection_name, name)
+                    await _drop_index(collection, name)
+                    to_create.append(index)
+                else:
+                    logger.warning("Index %s.%s differs from its declaration", collection_name, name)
+
+        for index in to_create:
+            try:
+                await collection.create_indexes([index])
+                logger.info("Created index %s.%s", collection_name, index.document["name"])
+            except PyMongoError as e:
+                logger.error("Could not create index %s.%s: %s", collection_name, index.document["name"], e)
+
+def _matches(document: dict, info: dict) -> bool:
+    key = list(document["key"].items())
+    # Text indexes are reported with internal _fts/_ftsx keys, so only
+    # compare the key pattern of regular indexes
+    if "text" not in document["key"].values() and key != list(info["key"]):
+        return False
+    for option in ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds"):
+        if document.get(option) != info.get(option):
+            return False
+    return True
+
+async def _drop_index(collection, name: str) -> None:
+    try:
+        await collection.drop_index(name)
+    except PyMongoError as e:
+        logger.error("Could not drop index %s.%s: %s", collection.name, name, e)
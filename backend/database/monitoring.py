@@ -0,0 +1,48 @@
+from typing import Dict, Tuple
+from pymongo import monitoring
+from ..utils.metrics import Registry, registry
+import threading
+
+class CommandMetrics(monitoring.CommandListener):
+    """Time every MongoDB command by collection and command name.
+
+    Registered on the Motor client through ``event_listeners``. Callbacks run
+    on the driver's threads, so in-flight commands are tracked under a lock.
+    """
+
+    def __init__(self, metrics: Registry = registry):
+        self.duration = metrics.histogram(
+            "mongodb_command_duration_seconds",
+            "MongoDB command latency by collection and command",
+            ("collection", "command")
+        )
+        self.failures = metrics.counter(
+            "mongodb_command_failures_total",
+            "MongoDB commands that returned an error",
+            ("collection", "command")
+        )
+        self._pending: Dict[Tuple[int, object], str] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name == "getMore":
+            # getMore carries the cursor id under its name and the collection separately
+            target = event.command.get("collection")
+        else:
+            target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else ""
+        with self._lock:
+            self._pending[(event.request_id, event.connection_id)] = collection
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._pop(event)
+        self.duration.observe(event.duration_micros / 1_000_000, collection, event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._pop(event)
+        self.duration.observe(event.duration_micros / 1_000_000, collection, event.command_name)
+        self.failures.inc(collection, event.command_name)
+
+    def _pop(self, event) -> str:
+        with self._lock:
+            return self._pending.pop((event.request_id, event.connection_id), "")
@@ -0,0 +1,140 @@
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..utils.compression import CompressedBodyCache, StreamCompressor, compress, is_compressible, negotiate
+from ..utils.metrics import Registry, registry
+
+class CompressionMiddleware:
+    """Negotiate gzip or brotli for responses of at least ``minimum_size`` bytes.
+
+    Bodies above ``offload_size`` are compressed in a worker thread so large
+    listings do not stall the event loop. GET responses with an ETag are
+    compressed once and then served from the container's
+    ``CompressedBodyCache``. Streamed responses are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 256 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        metrics: Registry = registry
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.saved = metrics.counter(
+            "http_compression_saved_bytes_total",
+            "Response bytes saved by compression",
+            ("encoding",)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        container = getattr(scope["app"].state, "container", None)
+        cache: Optional[CompressedBodyCache] = getattr(container, "compressed_cache", None)
+        responder = _Responder(self, scope, send, encoding, cache)
+        await self.app(scope, receive, responder.send)
+
+    async def compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= self.offload_size:
+            return await run_in_threadpool(compress, body, encoding, self.gzip_level, self.brotli_quality)
+        return compress(body, encoding, self.gzip_level, self.brotli_quality)
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str, cache):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.cache = cache
+        self.start: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = (
+                message["status"] != 200
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            if not self.passthrough:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            return
+
+        if message["type"] != "http.response.body":
+            # e.g. http.response.zerocopysend, which is never compressed
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            chunk = self.compressor.process(body) if body else b""
+            if not more_body:
+                chunk += self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        if more_body:
+            # Streamed response: compress incrementally, length unknown
+            self.compressor = StreamCompressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            del headers["Content-Length"]
+            await self._flush_start()
+            await self._send({"type": "http.response.body", "body": self.compressor.process(body), "more_body": True})
+            return
+
+        if len(body) < self.middleware.minimum_size:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        compressed = await self._compressed(body)
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        self.middleware.saved.inc(self.encoding, amount=len(body) - len(compressed))
+        await self._flush_start()
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    async def _compressed(self, body: bytes) -> bytes:
+        etag = Headers(raw=self.start["headers"]).get("etag")
+        if self.cache is None or etag is None or self.scope["method"] != "GET":
+            return await self.middleware.compress(body, self.encoding)
+
+        key = (self.scope["path"], self.scope.get("query_string", b""), etag, self.encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = await self.middleware.compress(body, self.encoding)
+            self.cache.set(key, compressed)
+        return compressed
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            await self._send(self.start)
+            self.start = None
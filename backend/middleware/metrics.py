@@ -0,0 +1,82 @@
+from typing import Any, Dict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..utils.metrics import Registry, registry
+import time
+
+class MetricsMiddleware:
+    """Record per-route latency, in-flight requests and server errors.
+
+    Plain ASGI middleware rather than ``BaseHTTPMiddleware`` so it adds no
+    extra task or body buffering per request. Routes are labelled by their
+    path template (``/api/projects/{project_id}``), not the raw URL, to keep
+    label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Registry = registry):
+        self.app = app
+        self.latency = metrics.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route",
+            ("method", "route", "status")
+        )
+        self.in_flight = metrics.gauge(
+            "http_requests_in_flight",
+            "HTTP requests currently being handled",
+            ("method",)
+        )
+        self.server_errors = metrics.counter(
+            "http_server_errors_total",
+            "HTTP responses with a 5xx status",
+            ("method", "route", "status")
+        )
+        self.exceptions = metrics.counter(
+            "http_unhandled_exceptions_total",
+            "Exceptions that escaped the route handlers",
+            ("method", "route")
+        )
+        self._route_paths: Dict[Any, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            self.exceptions.inc(method, self._route(scope))
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.in_flight.dec(method)
+            route = self._route(scope)
+            status = str(status_code)
+            self.latency.observe(duration, method, route, status)
+            if status_code >= 500:
+                self.server_errors.inc(method, route, status)
+
+    def _route(self, scope: Scope) -> str:
+        # The router records the matched endpoint in the shared scope
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            path = getattr(endpoint, "__name__", "unknown")
+            for route in getattr(scope.get("app"), "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path_format
+                    break
+            self._route_paths[endpoint] = path
+        return path
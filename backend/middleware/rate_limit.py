@@ -0,0 +1,119 @@
+from typing import Optional
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..utils.metrics import Registry, registry
+import json
+import math
+
+# Bodies larger than this are not inspected for an email address
+MAX_INSPECTED_BODY = 64 * 1024
+
+class RateLimitMiddleware:
+    """Reject over-limit requests with 429 before FastAPI parses or validates them.
+
+    Rules and the limiter backend come from the application container. The
+    client IP is checked first; only if it passes is the raw JSON body read to
+    find an ``email`` field, which is then replayed unchanged to the app.
+
+    ``trusted_proxies`` is the number of reverse proxies in front of the app.
+    Each appends the address it received the request from to
+    ``X-Forwarded-For``, so the client is the entry that many places from
+    the right; anything further left was sent by the client and is ignored.
+    With no trusted proxies the header is not read at all.
+    """
+
+    def __init__(self, app: ASGIApp, trusted_proxies: int = 0, metrics: Registry = registry):
+        self.app = app
+        self.trusted_proxies = trusted_proxies
+        self.rejected = metrics.counter(
+            "http_rate_limited_total",
+            "Requests rejected by the rate limiter",
+            ("route", "key")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        container = getattr(scope["app"].state, "container", None)
+        limits = container.rate_limit_rules.get((scope["method"], scope["path"])) if container else None
+        if not limits:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = container.rate_limiter
+        route = f"{scope['method']} {scope['path']}"
+
+        ip_rate = limits.get("ip")
+        if ip_rate:
+            retry_after = await limiter.hit(f"ip:{route}:{self._client_ip(scope)}", ip_rate)
+            if retry_after:
+                self.rejected.inc(route, "ip")
+                await self._reject(scope, receive, send, retry_after)
+                return
+
+        email_rate = limits.get("email")
+        if email_rate:
+            body = await self._read_body(receive)
+            email = _extract_email(body)
+            if email:
+                retry_after = await limiter.hit(f"email:{route}:{email}", email_rate)
+                if retry_after:
+                    self.rejected.inc(route, "email")
+                    await self._reject(scope, receive, send, retry_after)
+                    return
+            receive = _replay(body, receive)
+
+        await self.app(scope, receive, send)
+
+    def _client_ip(self, scope: Scope) -> str:
+        if self.trusted_proxies:
+            forwarded = [
+                address.strip()
+                for name, value in scope["headers"] if name == b"x-forwarded-for"
+                for address in value.decode("latin-1").split(",")
+            ]
+            if forwarded:
+                # Fewer entries than proxies: every entry was still added by one of them
+                return forwarded[max(len(forwarded) - self.trusted_proxies, 0)]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, retry_after: float) -> None:
+        response = JSONResponse(
+            {"detail": "Too many requests"},
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
+
+def _extract_email(body: bytes) -> Optional[str]:
+    if not body or len(body) > MAX_INSPECTED_BODY:
+        return None
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) else None
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay_receive() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay_receive
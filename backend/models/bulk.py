@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List
+
+class BulkItemError(BaseModel):
+    index: int
+    error: str
+
+class BulkResult(BaseModel):
+    inserted_count: int
+    inserted_ids: List[str]
+    errors: List[BulkItemError]
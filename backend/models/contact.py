@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from pydantic import BaseModel, Field, EmailStr, model_validator
+from typing import List, Literal, Optional
 from datetime import datetime
 import uuid
 
@@ -16,8 +16,40 @@ class Contact(ContactBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = Field(default_factory=datetime.utcnow)
     read: bool = False
+    # Set by the spam filter: reasons the submission looked suspicious
+    flags: List[str] = Field(default_factory=list)
+    # Near-identical resubmissions collapsed into this contact
+    duplicate_count: int = 0
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+class DailyCount(BaseModel):
+    date: str
+    count: int
+
+class ContactStats(BaseModel):
+    total: int
+    unread: int
+    per_day: List[DailyCount]
+
+class ContactFilter(BaseModel):
+    email: Optional[EmailStr] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    read: Optional[bool] = None
+
+class ContactBulkRequest(BaseModel):
+    action: Literal["mark_read", "delete"]
+    ids: Optional[List[str]] = None
+    filter: Optional[ContactFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter needs at least one condition")
+        return self
+
+class ContactBulkResult(BaseModel):
+    action: str
+    matched_count: int
+    affected_count: int
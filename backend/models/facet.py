@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import List
+
+class TechnologyFacet(BaseModel):
+    tag: str
+    label: str
+    count: int
+    project_ids: List[str]
@@ -34,8 +34,4 @@ class PersonalInfoUpdate(BaseModel):
 class PersonalInfo(PersonalInfoBase):
     id: str = Field(default="personal_info")
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    version: int = 1
\ No newline at end of file
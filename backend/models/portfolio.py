@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from .personal_info import PersonalInfo
+from .project import Project
+from .skill import SkillCategory
+
+class Portfolio(BaseModel):
+    personal_info: Optional[PersonalInfo] = None
+    featured_projects: List[Project]
+    skills: List[SkillCategory]
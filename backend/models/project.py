@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
 
@@ -30,12 +30,16 @@ class ProjectUpdate(BaseModel):
     github_link: Optional[str] = None
     featured: Optional[bool] = None
 
+class ImageVariants(BaseModel):
+    width: int
+    height: int
+    # Media type -> srcset, e.g. {"image/webp": "/api/images/ab/ab12-320w-q80.webp 320w, ..."}
+    srcset: Dict[str, str]
+
 class Project(ProjectBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    version: int = 1
+    # Image path -> resized derivatives, filled in by the image pipeline
+    image_variants: Dict[str, ImageVariants] = Field(default_factory=dict)
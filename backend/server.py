@@ -1,34 +1,62 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from pathlib import Path
 import os
 import logging
 import sys
 from contextlib import asynccontextmanager
+from datetime import datetime
 
 # Import database and services
 from .database.database import connect_to_mongo, close_mongo_connection, get_database
 from .services.project_service import ProjectService
 from .services.personal_info_service import PersonalInfoService
 from .services.contact_service import ContactService
+from .services.skill_service import SkillService
+from .services.portfolio_service import PortfolioService
+from .services.image_pipeline import DERIVATIVE_URL_PREFIX, derivative_dir
+from .services.contact_ingest import IngestQueueFullError
+from .container import Container
+from .middleware.metrics import MetricsMiddleware
+from .middleware.rate_limit import RateLimitMiddleware
+from .middleware.compression import CompressionMiddleware
+from .utils.metrics import registry
+from .services.pagination import MAX_PAGE_SIZE, PaginationError, parse_fields, parse_list
+from .services.versioning import VersionConflictError, parse_if_match
+from .utils import ndjson
+from .utils.media import RangeFileResponse
+from .utils.fast_json import RawJSONResponse, SerializedDocument, SerializedListing, dump_json
+from .utils.http_cache import ImmutableStaticFiles, conditional_response, document_etag, list_etag
 
 # Import models
 from .models.project import Project, ProjectCreate, ProjectUpdate
 from .models.personal_info import PersonalInfo, PersonalInfoCreate, PersonalInfoUpdate
-from .models.contact import Contact, ContactCreate
-from typing import List
+from .models.contact import Contact, ContactBulkRequest, ContactBulkResult, ContactCreate, ContactStats
+from .models.skill import SkillCategory, SkillCategoryCreate, SkillCategoryUpdate
+from .models.portfolio import Portfolio
+from .models.bulk import BulkResult
+from .models.facet import TechnologyFacet
+from typing import Any, Dict, List, Optional
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Upper bound on the number of items accepted by one bulk request
+MAX_BULK_ITEMS = int(os.environ.get('MAX_BULK_ITEMS', '1000'))
+
 # Lifespan context manager for startup and shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    container = Container(await get_database())
+    await container.start()
+    app.state.container = container
     yield
     # Shutdown
+    await container.stop()
     await close_mongo_connection()
 
 # Create the main app with lifespan
@@ -37,25 +65,129 @@ app = FastAPI(lifespan=lifespan)
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Dependency to get database
-async def get_db():
-    return await get_database()
+# Application-scoped singletons, created once in lifespan
+async def get_container(request: Request) -> Container:
+    return request.app.state.container
+
+async def get_project_service(request: Request) -> ProjectService:
+    return request.app.state.container.project_service
+
+async def get_personal_info_service(request: Request) -> PersonalInfoService:
+    return request.app.state.container.personal_info_service
+
+async def get_contact_service(request: Request) -> ContactService:
+    return request.app.state.container.contact_service
 
-# Helper functions to get services
-async def get_project_service(db=Depends(get_db)):
-    return ProjectService(db)
+async def get_skill_service(request: Request) -> SkillService:
+    return request.app.state.container.skill_service
 
-async def get_personal_info_service(db=Depends(get_db)):
-    return PersonalInfoService(db)
+async def get_portfolio_service(request: Request) -> PortfolioService:
+    return request.app.state.container.portfolio_service
+
+def fast_json_enabled(request: Request) -> bool:
+    return request.app.state.container.fast_json
+
+def listing_response(
+    request: Request,
+    response: Response,
+    items: list,
+    cursor: Optional[str] = None
+):
+    """Return a listing with cache validators, or 304 if the client's copy is current.
 
-async def get_contact_service(db=Depends(get_db)):
-    return ContactService(db)
+    Listings carry only an ETag: the newest ``updated_at`` among the items
+    does not move when an item is deleted, so it cannot serve as
+    ``Last-Modified``.
+
+    The next page cursor is exposed as a header. Projected items are plain
+    dicts that do not satisfy the full response model, so they are always
+    returned as a ready-made JSON response; in fast JSON mode model lists are
+    too, skipping response model revalidation.
+    """
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    not_modified = conditional_response(request, response, list_etag(items, cursor or ""))
+    if not_modified:
+        return not_modified
+    if fast_json_enabled(request) or (items and isinstance(items[0], dict)):
+        return RawJSONResponse(dump_json(items), headers=dict(response.headers))
+    return items
+
+def serialized_listing_response(request: Request, response: Response, listing: SerializedListing):
+    """Like ``listing_response`` for a cached listing, reusing its memoized ETag and body."""
+    not_modified = conditional_response(request, response, listing.etag)
+    if not_modified:
+        return not_modified
+    if fast_json_enabled(request):
+        return RawJSONResponse(listing.body(), headers=dict(response.headers))
+    return listing.items
+
+def serialized_document_response(request: Request, response: Response, serialized: SerializedDocument):
+    """Like ``document_response`` for a cached document, reusing its ETag and memoized body."""
+    not_modified = conditional_response(request, response, serialized.etag, serialized.last_modified)
+    if not_modified:
+        return not_modified
+    if fast_json_enabled(request):
+        return RawJSONResponse(serialized.body(), headers=dict(response.headers))
+    return serialized.document
+
+def document_response(request: Request, response: Response, document, last_modified: Optional[datetime] = None):
+    """Return a single document with cache validators, or 304 if unchanged."""
+    not_modified = conditional_response(request, response, document_etag(document), last_modified)
+    if not_modified:
+        return not_modified
+    if fast_json_enabled(request):
+        return RawJSONResponse(dump_json(document), headers=dict(response.headers))
+    return document
+
+def expected_version(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    try:
+        return parse_if_match(if_match)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
 
 # Root endpoint
 @api_router.get("/")
 async def root():
     return {"message": "Portfolio API is running!"}
 
+# Cache statistics
+@api_router.get("/cache/stats")
+async def get_cache_stats(container: Container = Depends(get_container)):
+    return {
+        "projects": container.project_cache.stats(),
+        "personal_info": container.personal_info_cache.stats(),
+        "skills": container.skill_cache.stats(),
+        "portfolio": container.portfolio_cache.stats(),
+        "compressed_responses": container.compressed_cache.stats(),
+        "media": container.media_store.stats()
+    }
+
+# Aggregated homepage data
+@api_router.get("/portfolio", response_model=Portfolio)
+async def get_portfolio(
+    request: Request,
+    response: Response,
+    portfolio_service: PortfolioService = Depends(get_portfolio_service)
+):
+    try:
+        portfolio = await portfolio_service.get_portfolio()
+        return serialized_document_response(request, response, portfolio)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Media files (project videos, resume) with Range support
+@api_router.api_route("/media/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_media(
+    path: str,
+    request: Request,
+    container: Container = Depends(get_container)
+):
+    media_file = container.media_store.open(path)
+    if media_file is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    return RangeFileResponse(media_file, request.headers, request.method)
+
 # Project endpoints
 @api_router.post("/projects", response_model=Project)
 async def create_project(
@@ -67,34 +199,119 @@ async def create_project(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/projects/bulk", response_model=BulkResult)
+async def create_projects_bulk(
+    projects: List[Dict[str, Any]],
+    ordered: bool = True,
+    project_service: ProjectService = Depends(get_project_service)
+):
+    if len(projects) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} projects per request")
+    try:
+        return await project_service.create_projects(projects, ordered=ordered)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/projects/export")
+async def export_projects(
+    project_service: ProjectService = Depends(get_project_service)
+):
+    return StreamingResponse(
+        project_service.export_projects(),
+        media_type=ndjson.MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'}
+    )
+
+@api_router.get("/projects/facets", response_model=List[TechnologyFacet])
+async def get_technology_facets(
+    request: Request,
+    response: Response,
+    project_service: ProjectService = Depends(get_project_service)
+):
+    try:
+        facets = project_service.technology_facets()
+        not_modified = conditional_response(request, response, project_service.facet_index.etag)
+        if not_modified:
+            return not_modified
+        return facets
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/projects/search", response_model=List[Project])
+async def search_projects(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    project_service: ProjectService = Depends(get_project_service)
+):
+    try:
+        projects = project_service.search_projects(q, limit)
+        return listing_response(request, response, projects)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/projects", response_model=List[Project])
 async def get_all_projects(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    technologies: Optional[str] = None,
+    featured: Optional[bool] = None,
+    tech: Optional[str] = None,
+    tech_match: str = Query("all", pattern="^(all|any)$"),
     project_service: ProjectService = Depends(get_project_service)
 ):
     try:
-        return await project_service.get_all_projects()
+        tags = parse_list(tech)
+        if limit is None and after is None and fields is None and technologies is None and featured is None:
+            if tags:
+                # Served from the facet view and the cached listing, without a query
+                projects = await project_service.filter_by_technology(tags, tech_match == "all")
+                return listing_response(request, response, projects)
+            listing = await project_service.get_project_listing()
+            return serialized_listing_response(request, response, listing)
+        projects, cursor = await project_service.list_projects(
+            limit=limit,
+            after=after,
+            fields=parse_fields(fields, Project.model_fields),
+            technologies=parse_list(technologies),
+            featured=featured,
+            tech=tags,
+            tech_match_all=tech_match == "all"
+        )
+        return listing_response(request, response, projects, cursor)
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/projects/featured", response_model=List[Project])
 async def get_featured_projects(
+    request: Request,
+    response: Response,
     project_service: ProjectService = Depends(get_project_service)
 ):
     try:
-        return await project_service.get_featured_projects()
+        listing = await project_service.get_project_listing(featured_only=True)
+        return serialized_listing_response(request, response, listing)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/projects/{project_id}", response_model=Project)
 async def get_project(
     project_id: str,
+    request: Request,
+    response: Response,
     project_service: ProjectService = Depends(get_project_service)
 ):
     try:
         project = await project_service.get_project(project_id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
-        return project
+        return document_response(request, response, project, project.updated_at)
     except HTTPException:
         raise
     except Exception as e:
@@ -104,13 +321,18 @@ async def get_project(
 async def update_project(
     project_id: str,
     project_data: ProjectUpdate,
+    response: Response,
+    version: Optional[int] = Depends(expected_version),
     project_service: ProjectService = Depends(get_project_service)
 ):
     try:
-        project = await project_service.update_project(project_id, project_data)
+        project = await project_service.update_project(project_id, project_data, expected_version=version)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
+        response.headers["ETag"] = document_etag(project)
         return project
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -144,6 +366,8 @@ async def create_or_update_personal_info(
 
 @api_router.get("/personal-info", response_model=PersonalInfo)
 async def get_personal_info(
+    request: Request,
+    response: Response,
     personal_info_service: PersonalInfoService = Depends(get_personal_info_service)
 ):
     try:
@@ -155,20 +379,101 @@ async def get_personal_info(
                 title="Developer",
                 email="contact@example.com"
             )
-        return personal_info
+        return document_response(request, response, personal_info, personal_info.updated_at)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.put("/personal-info", response_model=PersonalInfo)
 async def update_personal_info(
     personal_info_data: PersonalInfoUpdate,
+    response: Response,
+    version: Optional[int] = Depends(expected_version),
     personal_info_service: PersonalInfoService = Depends(get_personal_info_service)
 ):
     try:
-        personal_info = await personal_info_service.update_personal_info(personal_info_data)
+        personal_info = await personal_info_service.update_personal_info(personal_info_data, expected_version=version)
         if not personal_info:
             raise HTTPException(status_code=404, detail="Personal info not found")
+        response.headers["ETag"] = document_etag(personal_info)
         return personal_info
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Skill endpoints
+@api_router.post("/skills", response_model=SkillCategory)
+async def create_skill_category(
+    skill_category: SkillCategoryCreate,
+    skill_service: SkillService = Depends(get_skill_service)
+):
+    try:
+        return await skill_service.create_skill_category(skill_category)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/skills", response_model=List[SkillCategory])
+async def get_all_skill_categories(
+    request: Request,
+    response: Response,
+    skill_service: SkillService = Depends(get_skill_service)
+):
+    try:
+        listing = await skill_service.get_skill_listing()
+        return serialized_listing_response(request, response, listing)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/skills/{category_id}", response_model=SkillCategory)
+async def get_skill_category(
+    category_id: str,
+    request: Request,
+    response: Response,
+    skill_service: SkillService = Depends(get_skill_service)
+):
+    try:
+        skill_category = await skill_service.get_skill_category(category_id)
+        if not skill_category:
+            raise HTTPException(status_code=404, detail="Skill category not found")
+        return document_response(request, response, skill_category, skill_category.updated_at)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.put("/skills/{category_id}", response_model=SkillCategory)
+async def update_skill_category(
+    category_id: str,
+    skill_category_data: SkillCategoryUpdate,
+    response: Response,
+    version: Optional[int] = Depends(expected_version),
+    skill_service: SkillService = Depends(get_skill_service)
+):
+    try:
+        skill_category = await skill_service.update_skill_category(category_id, skill_category_data, expected_version=version)
+        if not skill_category:
+            raise HTTPException(status_code=404, detail="Skill category not found")
+        response.headers["ETag"] = document_etag(skill_category)
+        return skill_category
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.delete("/skills/{category_id}")
+async def delete_skill_category(
+    category_id: str,
+    skill_service: SkillService = Depends(get_skill_service)
+):
+    try:
+        success = await skill_service.delete_skill_category(category_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Skill category not found")
+        return {"message": "Skill category deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
@@ -182,28 +487,83 @@ async def create_contact(
 ):
     try:
         return await contact_service.create_contact(contact)
+    except IngestQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/contacts", response_model=List[Contact])
 async def get_all_contacts(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    read: Optional[bool] = None,
     contact_service: ContactService = Depends(get_contact_service)
 ):
     try:
-        return await contact_service.get_all_contacts()
+        cursor = None
+        if limit is None and after is None and fields is None and read is None:
+            contacts = await contact_service.get_all_contacts()
+        else:
+            contacts, cursor = await contact_service.list_contacts(
+                limit=limit,
+                after=after,
+                fields=parse_fields(fields, Contact.model_fields),
+                read=read
+            )
+        # No Last-Modified: marking a contact as read does not change a timestamp
+        return listing_response(request, response, contacts, cursor)
+    except PaginationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/contacts/bulk", response_model=ContactBulkResult)
+async def bulk_update_contacts(
+    request: ContactBulkRequest,
+    contact_service: ContactService = Depends(get_contact_service)
+):
+    if request.ids is not None and len(request.ids) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} ids per request")
+    try:
+        return await contact_service.bulk_update(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/contacts/stats", response_model=ContactStats)
+async def get_contact_stats(
+    days: int = Query(30, ge=1, le=366),
+    contact_service: ContactService = Depends(get_contact_service)
+):
+    try:
+        return await contact_service.get_stats(days)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/contacts/export")
+async def export_contacts(
+    contact_service: ContactService = Depends(get_contact_service)
+):
+    return StreamingResponse(
+        contact_service.export_contacts(),
+        media_type=ndjson.MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="contacts.ndjson"'}
+    )
+
 @api_router.get("/contacts/{contact_id}", response_model=Contact)
 async def get_contact(
     contact_id: str,
+    request: Request,
+    response: Response,
     contact_service: ContactService = Depends(get_contact_service)
 ):
     try:
         contact = await contact_service.get_contact(contact_id)
         if not contact:
             raise HTTPException(status_code=404, detail="Contact not found")
-        return contact
+        return document_response(request, response, contact)
     except HTTPException:
         raise
     except Exception as e:
@@ -239,9 +599,32 @@ async def delete_contact(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Prometheus scrape endpoint, outside the /api prefix by convention
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type=registry.CONTENT_TYPE)
+
 # Include the router in the main app
 app.include_router(api_router)
 
+# Content-addressed image derivatives written by the image pipeline
+app.mount(DERIVATIVE_URL_PREFIX, ImmutableStaticFiles(directory=derivative_dir(), check_dir=False), name="images")
+
+# Innermost, so rejected requests never reach body parsing but 429s still carry CORS headers
+app.add_middleware(
+    RateLimitMiddleware,
+    trusted_proxies=int(os.environ.get('TRUSTED_PROXIES', '0'))
+)
+
+# gzip / brotli for large bodies, outside the rate limiter so every route is covered
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_BYTES', '1024')),
+    offload_size=int(os.environ.get('COMPRESSION_OFFLOAD_BYTES', str(256 * 1024))),
+    gzip_level=int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6')),
+    brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -249,8 +632,12 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+# Outermost middleware, so latency covers CORS handling and error responses
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """Versioned in-memory LRU cache with a per-entry time to live.
+
+    Every write to the underlying data calls ``invalidate()``, which bumps
+    ``version`` and drops all entries. Loads that started before an
+    invalidation are not stored, so a slow read can never repopulate the
+    cache with data that is already stale.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 64):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, expires_at, value = entry
+            if version == self.version and expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        if version is not None and version != self.version:
+            # Invalidated while the value was being loaded
+            return
+        self._entries[key] = (self.version, time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key`` or load it once.
+
+        Concurrent misses for the same key share a single ``loader`` call,
+        so a burst of traffic on a cold cache results in one database query.
+        """
+        if not self.enabled:
+            self.misses += 1
+            return await loader()
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        version = self.version
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so it is not reported as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self.set(key, value, version)
+            return value
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._entries.clear()
+        # Waiters on in-flight loads still get a result, but new callers
+        # must not join a load that started before this write
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
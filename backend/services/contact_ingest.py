@@ -0,0 +1,246 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError, PyMongoError
+from ..models.contact import Contact
+from .contact_stats import ContactCounters
+from ..utils.metrics import registry
+from ..utils.ndjson import dumps_line
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# MongoDB duplicate key error; replayed spool entries that were already stored
+DUPLICATE_KEY = 11000
+
+class IngestQueueFullError(Exception):
+    """Raised when a submission cannot be queued within the enqueue timeout."""
+
+class ContactIngestQueue:
+    """Write-behind buffer that stores contact submissions in batches.
+
+    ``submit`` returns as soon as the contact is queued and appended to a local
+    spool file. A background task flushes the queue with ``insert_many`` once
+    ``batch_size`` contacts are waiting or ``flush_interval`` seconds have
+    passed since the first one arrived. Contacts are only removed from the
+    spool after MongoDB has stored them. On startup any spooled contacts left
+    by a crash are stored first; the unique ``id`` index makes replays
+    idempotent.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        spool_path: Path,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+        enqueue_timeout: float = 1.0,
+        max_spool_bytes: int = 16 * 1024 * 1024,
+        fsync: bool = False,
+        counters: Optional[ContactCounters] = None
+    ):
+        self.collection = collection
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_spool_bytes = max_spool_bytes
+        self.fsync = fsync
+        # Counted when stored, not when accepted, so replays are not counted twice
+        self.counters = counters
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        # Accepted but not yet stored, by contact id
+        self._pending: Dict[str, dict] = {}
+        # Spooled contacts left by a previous process, stored before new ones
+        self._backlog: List[dict] = []
+        self._spool = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._depth = registry.gauge("contact_ingest_pending", "Contact submissions accepted but not yet stored")
+        self._flushed = registry.counter("contact_ingest_flushed_total", "Contacts stored by the write-behind queue")
+
+    async def start(self) -> None:
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load_spool()
+        self._spool = open(self.spool_path, "ab")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting submissions and flush everything still queued."""
+        self._closing = True
+        if self._task:
+            try:
+                # Wake the flusher if it is waiting for a batch to fill up
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+            try:
+                await asyncio.wait_for(self._drained(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("%d contacts not stored on shutdown; kept in %s", len(self._pending), self.spool_path)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._spool:
+            self._compact_spool()
+            self._spool.close()
+            self._spool = None
+
+    async def submit(self, contact: Contact) -> None:
+        if self._closing:
+            raise IngestQueueFullError("Contact ingestion is shutting down")
+        document = contact.dict()
+        # Pending and spooled before it is queued, so the flusher can never
+        # store it before it is tracked
+        self._pending[document["id"]] = document
+        self._write_spool(document)
+        try:
+            await asyncio.wait_for(self._queue.put(document), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            # Other submissions may have been spooled since, so rewrite rather than truncate
+            del self._pending[document["id"]]
+            self._compact_spool()
+            raise IngestQueueFullError("Contact ingestion queue is full")
+        finally:
+            self._depth.set(len(self._pending))
+
+    def pending(self, contact_id: str) -> Optional[Contact]:
+        """Return a contact that has been accepted but not yet stored."""
+        document = self._pending.get(contact_id)
+        return Contact(**document) if document else None
+
+    def add_duplicate(self, contact_id: str) -> bool:
+        """Count a collapsed resubmission against a contact that is not stored yet."""
+        document = self._pending.get(contact_id)
+        if document is None:
+            return False
+        document["duplicate_count"] = document.get("duplicate_count", 0) + 1
+        return True
+
+    async def _drained(self) -> None:
+        while self._pending:
+            await asyncio.sleep(0.05)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._backlog:
+            batch = self._backlog[:self.batch_size]
+            del self._backlog[:self.batch_size]
+            await self._flush(batch)
+
+        while True:
+            # None is the wake-up sent by stop(), never a contact
+            document = await self._queue.get()
+            if document is None:
+                continue
+            batch = [document]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size and not self._closing:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    document = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if document is None:
+                    break
+                batch.append(document)
+            # While draining, take whatever else is already queued
+            while len(batch) < self.batch_size and not self._queue.empty():
+                document = self._queue.get_nowait()
+                if document is not None:
+                    batch.append(document)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[dict]) -> None:
+        delay = 0.1
+        while True:
+            # Duplicates counted while the insert is in flight are applied after it
+            sent = {document["id"]: document.get("duplicate_count", 0) for document in batch}
+            try:
+                await self._insert(batch)
+                break
+            except PyMongoError as e:
+                logger.warning("Storing %d queued contacts failed (%s); retrying in %.1fs", len(batch), e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+        # Once a contact leaves _pending, later duplicates are counted in MongoDB
+        for document in batch:
+            self._pending.pop(document["id"], None)
+        try:
+            await self._apply_late_duplicates(batch, sent)
+        except PyMongoError as e:
+            logger.warning("Counting duplicates of stored contacts failed: %s", e)
+        self._depth.set(len(self._pending))
+        self._flushed.inc(amount=len(batch))
+        if not self._pending:
+            self._spool.truncate(0)
+        elif self._spool.tell() > self.max_spool_bytes:
+            self._compact_spool()
+
+    async def _insert(self, documents: List[dict]) -> None:
+        """Store a batch; raises only for errors worth retrying."""
+        # insert_many adds _id to the documents it is given
+        not_stored = set()
+        try:
+            await self.collection.insert_many([dict(d) for d in documents], ordered=False)
+        except BulkWriteError as e:
+            if e.details.get("writeConcernErrors"):
+                raise
+            for error in e.details.get("writeErrors", []):
+                not_stored.add(error["index"])
+                if error.get("code") != DUPLICATE_KEY:
+                    # Rejected documents would fail again on every retry
+                    logger.error("Dropping contact %s: %s", documents[error["index"]]["id"], error.get("errmsg"))
+        if self.counters is not None:
+            await self.counters.record_created(d for i, d in enumerate(documents) if i not in not_stored)
+
+    async def _apply_late_duplicates(self, batch: List[dict], sent: Dict[str, int]) -> None:
+        for document in batch:
+            late = document.get("duplicate_count", 0) - sent[document["id"]]
+            if late:
+                await self.collection.update_one({"id": document["id"]}, {"$inc": {"duplicate_count": late}})
+
+    def _write_spool(self, document: dict) -> None:
+        self._spool.write(dumps_line(document))
+        self._spool.flush()
+        if self.fsync:
+            os.fsync(self._spool.fileno())
+
+    def _compact_spool(self) -> None:
+        """Rewrite the spool so it only holds contacts that are still pending."""
+        tmp_path = self.spool_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as tmp:
+            for document in self._pending.values():
+                tmp.write(dumps_line(document))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        self._spool.close()
+        os.replace(tmp_path, self.spool_path)
+        self._spool = open(self.spool_path, "ab")
+
+    def _load_spool(self) -> None:
+        if not self.spool_path.exists():
+            return
+        with open(self.spool_path, "rb") as spool:
+            for line in spool:
+                try:
+                    document = Contact(**json.loads(line)).dict()
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    logger.warning("Skipping unreadable spool entry in %s", self.spool_path)
+                    continue
+                if document["id"] not in self._pending:
+                    self._pending[document["id"]] = document
+                    self._backlog.append(document)
+        if self._backlog:
+            logger.info("Replaying %d spooled contacts from %s", len(self._backlog), self.spool_path)
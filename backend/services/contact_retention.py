@@ -0,0 +1,169 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+from .contact_stats import ContactCounters, day_of
+from ..database.indexes import register_indexes
+from ..utils.metrics import registry
+from ..utils.ndjson import dumps_line
+import asyncio
+import logging
+import os
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+register_indexes("contacts_archive", [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="created_at_id"),
+    # Set once a contact is safely in a cold file; MongoDB removes it after that
+    IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+])
+
+# MongoDB duplicate key error; contacts a previous, interrupted run already archived
+DUPLICATE_KEY = 11000
+
+COLD_SUFFIX = ".ndjson.zst"
+
+class ContactRetention:
+    """Moves contacts through three storage tiers.
+
+    1. Read contacts older than ``archive_after`` leave ``contacts`` for
+       ``contacts_archive``, ``batch_size`` at a time. Each batch is inserted
+       before it is deleted, so an interrupted run is simply repeated.
+    2. Archived contacts older than ``cold_after`` are written to
+       zstd-compressed NDJSON files in ``cold_dir``, one file per batch,
+       and stamped with ``expires_at``.
+    3. The TTL index on ``expires_at`` removes them from the archive once
+       ``grace`` has passed; until then they can still be fetched by id.
+
+    Without a ``cold_dir`` (or without zstandard) contacts stay in the
+    archive indefinitely: MongoDB only deletes what is already on disk, so
+    ``cold_dir`` must be durable storage, not a container's scratch space.
+    """
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        cold_dir: Optional[Path] = None,
+        archive_after: timedelta = timedelta(days=90),
+        cold_after: timedelta = timedelta(days=365),
+        grace: timedelta = timedelta(days=7),
+        batch_size: int = 500,
+        zstd_level: int = 10,
+        counters: Optional[ContactCounters] = None
+    ):
+        self.contacts = database.contacts
+        self.archive = database.contacts_archive
+        self.cold_dir = cold_dir
+        self.archive_after = archive_after
+        self.cold_after = cold_after
+        self.grace = grace
+        self.batch_size = batch_size
+        self.zstd_level = zstd_level
+        self.counters = counters
+        self._moved = registry.counter("contact_retention_moved_total", "Contacts moved to an older storage tier", ["tier"])
+        if cold_dir is not None and zstandard is None:
+            logger.warning("zstandard is not installed; archived contacts will not be exported to %s", cold_dir)
+
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Run both moves to completion; returns how many contacts each tier received."""
+        now = now or datetime.utcnow()
+        archived = await self.archive_read_contacts(now)
+        exported = 0
+        if self.cold_dir is not None and zstandard is not None:
+            exported = await self.export_cold_archives(now)
+        return {"archived": archived, "exported": exported}
+
+    async def archive_read_contacts(self, now: datetime) -> int:
+        cutoff = now - self.archive_after
+        moved = 0
+        while True:
+            # Served by the read_created_at_id index on contacts
+            documents = await self.contacts.find(
+                {"read": True, "created_at": {"$lt": cutoff}},
+                {"_id": 0}
+            ).sort("created_at", ASCENDING).limit(self.batch_size).to_list(None)
+            if not documents:
+                return moved
+
+            for document in documents:
+                document["archived_at"] = now
+            await self._insert_archived(documents)
+
+            ids = [document["id"] for document in documents]
+            result = await self.contacts.delete_many({"id": {"$in": ids}})
+            await self._record_removed(documents, result.deleted_count)
+            moved += result.deleted_count
+            self._moved.inc("archive", amount=result.deleted_count)
+            if len(documents) < self.batch_size:
+                return moved
+
+    async def export_cold_archives(self, now: datetime) -> int:
+        cutoff = now - self.cold_after
+        loop = asyncio.get_running_loop()
+        exported = 0
+        while True:
+            documents = await self.archive.find(
+                {"created_at": {"$lt": cutoff}, "expires_at": {"$exists": False}},
+                {"_id": 0}
+            ).sort([("created_at", ASCENDING), ("id", ASCENDING)]).limit(self.batch_size).to_list(None)
+            if not documents:
+                return exported
+
+            # Compression and disk IO stay off the event loop
+            path = await loop.run_in_executor(None, self._write_cold_file, documents)
+            await self.archive.update_many(
+                {"id": {"$in": [document["id"] for document in documents]}},
+                {"$set": {"expires_at": now + self.grace, "cold_file": path.name}}
+            )
+            exported += len(documents)
+            self._moved.inc("cold", amount=len(documents))
+            if len(documents) < self.batch_size:
+                return exported
+
+    async def _insert_archived(self, documents: List[dict]) -> None:
+        try:
+            await self.archive.insert_many([dict(d) for d in documents], ordered=False)
+        except BulkWriteError as e:
+            if e.details.get("writeConcernErrors"):
+                raise
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") != DUPLICATE_KEY:
+                    raise
+
+    async def _record_removed(self, documents: List[dict], deleted: int) -> None:
+        if self.counters is None:
+            return
+        if deleted == len(documents):
+            # Only read contacts are archived, so no unread ones are removed
+            await self.counters.record_removed(deleted, 0, Counter(day_of(d["created_at"]) for d in documents))
+        else:
+            # Another worker moved part of this batch
+            await self.counters.reconcile()
+
+    def _write_cold_file(self, documents: List[dict]) -> Path:
+        """Write one batch as a compressed NDJSON file, replaced atomically.
+
+        The name derives from the batch's first contact, so re-exporting a
+        batch after a crash overwrites the earlier file instead of adding one.
+        """
+        first = documents[0]
+        name = f"contacts-{first['created_at']:%Y%m%dT%H%M%S}-{first['id'][:8]}{COLD_SUFFIX}"
+        self.cold_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cold_dir / name
+        tmp = path.with_name(f".{name}.{os.getpid()}.tmp")
+        compressor = zstandard.ZstdCompressor(level=self.zstd_level)
+        with open(tmp, "wb") as f:
+            f.write(compressor.compress(b"".join(dumps_line(document) for document in documents)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return path
@@ -1,43 +1,216 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from ..models.contact import Contact, ContactCreate
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from ..models.contact import Contact, ContactBulkRequest, ContactBulkResult, ContactCreate, ContactStats
+from ..utils.ndjson import stream_cursor
+from .contact_ingest import ContactIngestQueue
+from .contact_stats import ContactCounters
+from .spam_filter import SpamFilter
+from .notifications import NotificationDispatcher
+from .pagination import SORT_ORDER, after_filter, next_cursor, projection_for
+from ..database.indexes import register_indexes
+from ..utils.metrics import registry
 from datetime import datetime
 
+register_indexes("contacts", [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    IndexModel([("read", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="read_created_at_id"),
+    IndexModel([("email", ASCENDING), ("created_at", DESCENDING)], name="email_created_at"),
+])
+
 class ContactService:
-    def __init__(self, database: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        ingest: Optional[ContactIngestQueue] = None,
+        counters: Optional[ContactCounters] = None,
+        spam_filter: Optional[SpamFilter] = None,
+        notifier: Optional[NotificationDispatcher] = None
+    ):
         self.database = database
         self.collection = database.contacts
+        # Old read contacts, moved out by ContactRetention
+        self.archive = database.contacts_archive
+        # Optional write-behind queue; when set, submissions are stored in batches
+        self.ingest = ingest
+        # Total / unread / per-day counts, updated by every write below
+        self.counters = counters if counters is not None else ContactCounters(database)
+        # Optional pre-insert screening for duplicates and spam
+        self.spam_filter = spam_filter
+        # Optional email / webhook notifications, sent by background workers
+        self.notifier = notifier
+        self._screened = registry.counter(
+            "contact_filter_decisions_total",
+            "Contact submissions by spam filter decision",
+            ["action"]
+        )
 
     async def create_contact(self, contact_data: ContactCreate) -> Contact:
         contact = Contact(**contact_data.dict())
+
+        if self.spam_filter is not None:
+            verdict = self.spam_filter.check(contact)
+            self._screened.inc(verdict.action)
+            if verdict.action == "drop":
+                # Answered like a stored submission so senders learn nothing
+                return contact
+            if verdict.action == "collapse" and await self._collapse(verdict.duplicate_of):
+                return contact
+            contact.flags = verdict.reasons
         
-        # Convert to dict for MongoDB insertion
-        contact_dict = contact.dict()
-        
-        # Insert into database
-        result = await self.collection.insert_one(contact_dict)
+        if self.ingest is not None:
+            await self.ingest.submit(contact)
+        else:
+            # Convert to dict for MongoDB insertion
+            contact_dict = contact.dict()
+            
+            # Insert into database
+            result = await self.collection.insert_one(contact_dict)
+            await self.counters.record_created([contact_dict])
         
+        if self.notifier is not None:
+            self.notifier.notify(contact)
         return contact
 
+    async def _collapse(self, original_id: str) -> bool:
+        """Count a resubmission against its original; False if the original is gone."""
+        if self.ingest is not None and self.ingest.add_duplicate(original_id):
+            return True
+        result = await self.collection.update_one(
+            {"id": original_id},
+            {"$inc": {"duplicate_count": 1}}
+        )
+        return result.matched_count > 0
+
     async def get_contact(self, contact_id: str) -> Optional[Contact]:
         contact_dict = await self.collection.find_one({"id": contact_id})
         if contact_dict:
             return Contact(**contact_dict)
-        return None
+        if self.ingest is not None:
+            # Accepted submissions are readable before their batch is stored
+            pending = self.ingest.pending(contact_id)
+            if pending is not None:
+                return pending
+        contact_dict = await self.archive.find_one({"id": contact_id})
+        return Contact(**contact_dict) if contact_dict else None
 
     async def get_all_contacts(self) -> List[Contact]:
         contacts = []
-        async for contact_dict in self.collection.find().sort("created_at", -1):
+        async for contact_dict in self.collection.find().sort(SORT_ORDER):
             contacts.append(Contact(**contact_dict))
         return contacts
 
+    async def list_contacts(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        read: Optional[bool] = None
+    ) -> Tuple[List[Union[Contact, dict]], Optional[str]]:
+        """Return one page of contacts and the cursor for the next page.
+
+        With ``fields`` set, items are plain dicts holding only those fields.
+        """
+        query = after_filter(after)
+        if read is not None:
+            query["read"] = read
+
+        cursor = self.collection.find(query, projection_for(fields)).sort(SORT_ORDER)
+        if limit:
+            # Fetch one extra document to know whether another page exists
+            cursor = cursor.limit(limit + 1)
+
+        contacts = []
+        async for contact_dict in cursor:
+            contacts.append(contact_dict if fields else Contact(**contact_dict))
+
+        has_more = bool(limit) and len(contacts) > limit
+        if has_more:
+            contacts = contacts[:limit]
+        return contacts, next_cursor(contacts, limit, has_more)
+
+    async def export_contacts(self) -> AsyncIterator[bytes]:
+        """Stream every stored contact as NDJSON without materializing a list.
+
+        Archived contacts follow the live ones and carry ``archived_at``.
+        Contacts that have already expired from the archive are only in the
+        cold files written by ContactRetention.
+        """
+        cursor = self.collection.find({}, {"_id": 0}).sort(SORT_ORDER).batch_size(500)
+        async for chunk in stream_cursor(cursor):
+            yield chunk
+        cursor = self.archive.find({}, {"_id": 0, "expires_at": 0, "cold_file": 0}).sort(SORT_ORDER).batch_size(500)
+        async for chunk in stream_cursor(cursor):
+            yield chunk
+
+    async def get_stats(self, days: int = 30) -> ContactStats:
+        return await self.counters.get(days)
+
     async def mark_as_read(self, contact_id: str) -> bool:
-        result = await self.collection.update_one(
-            {"id": contact_id},
-            {"$set": {"read": True}}
+        # Only an unread contact changes the counters
+        contact_dict = await self.collection.find_one_and_update(
+            {"id": contact_id, "read": {"$ne": True}},
+            {"$set": {"read": True}},
+            projection={"_id": 1}
         )
-        return result.modified_count > 0
+        if contact_dict is None:
+            return False
+        await self.counters.record_read()
+        return True
 
     async def delete_contact(self, contact_id: str) -> bool:
-        result = await self.collection.delete_one({"id": contact_id})
-        return result.deleted_count > 0
\ No newline at end of file
+        contact_dict = await self.collection.find_one_and_delete(
+            {"id": contact_id},
+            projection={"_id": 0, "created_at": 1, "read": 1}
+        )
+        if contact_dict is None:
+            # Archived contacts are no longer counted
+            result = await self.archive.delete_one({"id": contact_id})
+            return result.deleted_count > 0
+        await self.counters.record_deleted([contact_dict])
+        return True
+
+    async def bulk_update(self, request: ContactBulkRequest) -> ContactBulkResult:
+        """Mark read or delete every contact selected by id or filter in one write.
+
+        Counters are adjusted from the same selection. If a concurrent write
+        makes the counts disagree, the counters are recounted.
+        """
+        query = _selection_query(request)
+
+        if request.action == "mark_read":
+            matched = await self.collection.count_documents(query)
+            result = await self.collection.update_many(
+                {**query, "read": {"$ne": True}},
+                {"$set": {"read": True}}
+            )
+            await self.counters.record_read(result.modified_count)
+            return ContactBulkResult(action=request.action, matched_count=matched, affected_count=result.modified_count)
+
+        total, unread, days = await self.counters.breakdown(query)
+        result = await self.collection.delete_many(query)
+        if result.deleted_count == total:
+            await self.counters.record_removed(total, unread, days)
+        else:
+            await self.counters.reconcile()
+        return ContactBulkResult(action=request.action, matched_count=total, affected_count=result.deleted_count)
+
+def _selection_query(request: ContactBulkRequest) -> dict:
+    if request.ids is not None:
+        return {"id": {"$in": request.ids}}
+
+    query: dict = {}
+    selection = request.filter
+    if selection.email is not None:
+        query["email"] = selection.email
+    if selection.read is not None:
+        query["read"] = selection.read
+    created_at = {}
+    if selection.created_after is not None:
+        created_at["$gte"] = selection.created_after
+    if selection.created_before is not None:
+        created_at["$lt"] = selection.created_before
+    if created_at:
+        query["created_at"] = created_at
+    return query
@@ -0,0 +1,114 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+from ..models.contact import ContactStats, DailyCount
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The single counters document in the contact_stats collection
+STATS_ID = "contacts"
+
+def day_of(created_at: datetime) -> str:
+    return created_at.strftime("%Y-%m-%d")
+
+class ContactCounters:
+    """Total, unread and per-day contact counts kept in one document.
+
+    ``ContactService`` applies every change as a single ``$inc``, so reading
+    the stats is one lookup by ``_id`` however many contacts there are. The
+    counters are not updated in the same transaction as the contacts, so
+    ``reconcile()`` recounts them from the collection periodically.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.collection = database.contact_stats
+        self.contacts = database.contacts
+
+    async def record_created(self, contacts: Iterable[dict]) -> None:
+        contacts = list(contacts)
+        if not contacts:
+            return
+        days = Counter(day_of(contact["created_at"]) for contact in contacts)
+        unread = sum(1 for contact in contacts if not contact.get("read"))
+        await self._inc(total=len(contacts), unread=unread, days=days)
+
+    async def record_read(self, count: int = 1) -> None:
+        if count:
+            await self._inc(unread=-count)
+
+    async def record_deleted(self, contacts: Iterable[dict]) -> None:
+        contacts = list(contacts)
+        if not contacts:
+            return
+        days = Counter(day_of(contact["created_at"]) for contact in contacts)
+        unread = sum(1 for contact in contacts if not contact.get("read"))
+        await self.record_removed(len(contacts), unread, days)
+
+    async def get(self, days: int = 30, today: Optional[datetime] = None) -> ContactStats:
+        """Counters with one entry per day for the last ``days`` days, oldest first."""
+        document = await self.collection.find_one({"_id": STATS_ID}) or {}
+        per_day = document.get("days", {})
+        end = (today or datetime.utcnow()).date()
+        return ContactStats(
+            total=max(document.get("total", 0), 0),
+            unread=max(document.get("unread", 0), 0),
+            per_day=[
+                DailyCount(date=day, count=max(per_day.get(day, 0), 0))
+                for day in (
+                    (end - timedelta(days=offset)).isoformat()
+                    for offset in range(days - 1, -1, -1)
+                )
+            ]
+        )
+
+    async def breakdown(self, query: dict) -> Tuple[int, int, Counter]:
+        """Count the contacts matching ``query``: total, unread and per day."""
+        total = unread = 0
+        days: Counter = Counter()
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": {"day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}, "read": "$read"},
+                "count": {"$sum": 1},
+            }},
+        ]
+        async for group in self.contacts.aggregate(pipeline):
+            count = group["count"]
+            total += count
+            if not group["_id"].get("read"):
+                unread += count
+            days[group["_id"]["day"]] += count
+        return total, unread, days
+
+    async def record_removed(self, total: int, unread: int, days: Counter) -> None:
+        await self._inc(total=-total, unread=-unread, days={day: -count for day, count in days.items()})
+
+    async def reconcile(self) -> None:
+        """Recount every counter from the contacts collection and replace the stored ones.
+
+        Changes made while the recount runs may be lost; the next run
+        picks them up.
+        """
+        total, unread, days = await self.breakdown({})
+        await self.collection.replace_one(
+            {"_id": STATS_ID},
+            {"total": total, "unread": unread, "days": dict(days), "reconciled_at": datetime.utcnow()},
+            upsert=True
+        )
+
+    async def _inc(self, total: int = 0, unread: int = 0, days: Optional[dict] = None) -> None:
+        increments = {f"days.{day}": count for day, count in (days or {}).items()}
+        if total:
+            increments["total"] = total
+        if unread:
+            increments["unread"] = unread
+        if not increments:
+            return
+        try:
+            await self.collection.update_one({"_id": STATS_ID}, {"$inc": increments}, upsert=True)
+        except PyMongoError as e:
+            # The contact write itself succeeded; reconcile() repairs the counters
+            logger.warning("Could not update contact counters: %s", e)
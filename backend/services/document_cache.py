@@ -0,0 +1,111 @@
+from typing import Any, Generic, Optional, Tuple, Type, TypeVar
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pydantic import BaseModel
+from pymongo.errors import OperationFailure, PyMongoError
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+class WatchedDocument(Generic[ModelT]):
+    """Process-local copy of a single document, kept fresh across workers.
+
+    Reads are served from memory. Writes made by this process are applied with
+    ``set()`` straight away. Writes made by other workers arrive through a
+    MongoDB change stream or, where change streams are unavailable (standalone
+    servers), through a cheap poll of the document's version stamp.
+    """
+
+    def __init__(self, model: Type[ModelT], collection_name: str, document_id: str, poll_interval: float = 5.0):
+        self.model = model
+        self.collection_name = collection_name
+        self.document_id = document_id
+        self.poll_interval = poll_interval
+        self.collection: Optional[AsyncIOMotorCollection] = None
+        self.mode = "stopped"
+        self._value: Optional[ModelT] = None
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        self.collection = database[self.collection_name]
+        await self.refresh()
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.mode = "stopped"
+
+    async def get(self) -> Optional[ModelT]:
+        if not self._loaded:
+            await self.refresh()
+        return self._value
+
+    def set(self, value: Optional[ModelT]) -> None:
+        """Apply a local write, ignoring it if a newer version is already held."""
+        if value is not None and self._value is not None and _stamp(value) < _stamp(self._value):
+            return
+        self._value = value
+        self._loaded = True
+
+    async def refresh(self) -> None:
+        document = await self.collection.find_one({"id": self.document_id})
+        value = self.model(**document) if document else None
+        if value is None:
+            self._value = None
+        else:
+            self.set(value)
+        self._loaded = True
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "loaded": self._loaded,
+            "version": getattr(self._value, "version", None),
+        }
+
+    async def _watch(self) -> None:
+        try:
+            self.mode = "change_stream"
+            async with self.collection.watch([{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]) as stream:
+                async for _ in stream:
+                    await self.refresh()
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            # Standalone servers do not support change streams
+            logger.info("Change stream unavailable for %s (%s); polling every %ss",
+                        self.collection_name, e, self.poll_interval)
+        except Exception as e:
+            logger.warning("Change stream for %s failed (%s); polling every %ss",
+                           self.collection_name, e, self.poll_interval)
+        await self._poll()
+
+    async def _poll(self) -> None:
+        self.mode = "polling"
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                stamp = await self.collection.find_one(
+                    {"id": self.document_id},
+                    {"_id": 0, "version": 1, "updated_at": 1}
+                )
+                held = _stamp(self._value) if self._value is not None else None
+                current = _stamp(stamp) if stamp is not None else None
+                if current != held:
+                    await self.refresh()
+            except PyMongoError as e:
+                logger.warning("Polling %s failed: %s", self.collection_name, e)
+
+def _stamp(value: Any) -> Tuple[int, Any]:
+    if isinstance(value, dict):
+        return value.get("version", 1), value.get("updated_at")
+    return getattr(value, "version", 1), getattr(value, "updated_at", None)
@@ -0,0 +1,96 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+from ..models.facet import TechnologyFacet
+from ..models.project import Project
+from ..utils.http_cache import list_etag
+
+def normalize_tag(value: str) -> str:
+    """``" Node.js "`` and ``"node.JS"`` are the same tag."""
+    return " ".join(value.split()).casefold()
+
+class TechnologyFacetIndex:
+    """Materialized view of project technologies: tag -> project ids.
+
+    Maintained incrementally through the same ``add``/``remove``/``rebuild``
+    calls as the search index. Each tag is labelled with its most common
+    original spelling.
+    """
+
+    def __init__(self):
+        self._projects_by_tag: Dict[str, Set[str]] = {}
+        self._labels: Dict[str, Counter] = {}
+        self._tags_by_project: Dict[str, Dict[str, str]] = {}
+        self._facets: Optional[List[TechnologyFacet]] = None
+        self._etag: Optional[str] = None
+
+    def rebuild(self, projects: Iterable[Project]) -> None:
+        self._projects_by_tag = {}
+        self._labels = {}
+        self._tags_by_project = {}
+        self._facets = None
+        for project in projects:
+            self.add(project)
+
+    def add(self, project: Project) -> None:
+        if project.id in self._tags_by_project:
+            self.remove(project.id)
+
+        tags: Dict[str, str] = {}
+        for technology in project.technologies:
+            tag = normalize_tag(technology)
+            if tag:
+                tags.setdefault(tag, technology.strip())
+
+        for tag, label in tags.items():
+            self._projects_by_tag.setdefault(tag, set()).add(project.id)
+            self._labels.setdefault(tag, Counter())[label] += 1
+        self._tags_by_project[project.id] = tags
+        self._facets = None
+
+    def remove(self, project_id: str) -> None:
+        tags = self._tags_by_project.pop(project_id, None)
+        if tags is None:
+            return
+        for tag, label in tags.items():
+            project_ids = self._projects_by_tag[tag]
+            project_ids.discard(project_id)
+            labels = self._labels[tag]
+            labels[label] -= 1
+            if labels[label] <= 0:
+                del labels[label]
+            if not project_ids:
+                del self._projects_by_tag[tag]
+                del self._labels[tag]
+        self._facets = None
+
+    def facets(self) -> List[TechnologyFacet]:
+        """All tags, most used first. Rebuilt only after the index changes."""
+        if self._facets is None:
+            self._facets = sorted(
+                (
+                    TechnologyFacet(
+                        tag=tag,
+                        label=self._labels[tag].most_common(1)[0][0],
+                        count=len(project_ids),
+                        project_ids=sorted(project_ids)
+                    )
+                    for tag, project_ids in self._projects_by_tag.items()
+                ),
+                key=lambda facet: (-facet.count, facet.tag)
+            )
+            self._etag = list_etag((), *((f.tag, f.label, f.project_ids) for f in self._facets))
+        return self._facets
+
+    @property
+    def etag(self) -> str:
+        self.facets()
+        return self._etag
+
+    def match(self, technologies: List[str], match_all: bool = True) -> Set[str]:
+        """Ids of projects tagged with all (or any) of ``technologies``."""
+        sets = [self._projects_by_tag.get(normalize_tag(t), set()) for t in technologies]
+        if not sets:
+            return set()
+        if match_all:
+            return set.intersection(*sorted(sets, key=len))
+        return set.union(*sets)
@@ -0,0 +1,168 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..models.project import ImageVariants
+import asyncio
+import hashlib
+import io
+import logging
+import os
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# Public URL of the derivative directory, served by server.py
+DERIVATIVE_URL_PREFIX = "/api/images"
+
+MEDIA_TYPES = {"webp": "image/webp", "avif": "image/avif", "jpeg": "image/jpeg", "png": "image/png"}
+# Remembered results, one per source file version
+MAX_KNOWN_IMAGES = 1024
+
+EXTENSIONS = {"webp": "webp", "avif": "avif", "jpeg": "jpg", "png": "png"}
+
+def derivative_dir() -> Path:
+    return Path(os.environ.get('IMAGE_DERIVATIVE_DIR', str(ROOT_DIR / 'derivatives')))
+
+def generate_derivatives(
+    source: str,
+    output_dir: str,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    quality: int
+) -> Tuple[int, int, Dict[str, List[Tuple[int, str]]]]:
+    """Write resized copies of ``source`` and return its size and the files per format.
+
+    Runs in a worker process. Files are named after the SHA-256 of the source
+    bytes and the encoder quality, so unchanged images are never regenerated,
+    identical images shared by several projects are stored once, and a new
+    quality setting yields new URLs rather than stale immutable ones.
+    """
+    data = Path(source).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    files: Dict[str, List[Tuple[int, str]]] = {fmt: [] for fmt in formats}
+
+    with Image.open(io.BytesIO(data)) as image:
+        width, height = image.size
+        # Never upscale; an image narrower than every width gets one copy at its own size
+        targets = sorted({w for w in widths if w < width} or {width})
+        for target in targets:
+            resized = None
+            for fmt in formats:
+                name = f"{digest[:2]}/{digest}-{target}w-q{quality}.{EXTENSIONS[fmt]}"
+                path = Path(output_dir) / name
+                if not path.exists():
+                    if resized is None:
+                        resized = image.convert("RGBA") if image.mode not in ("RGB", "RGBA") else image.copy()
+                        if target != width:
+                            resized = resized.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+                    _save(resized, path, fmt, quality)
+                files[fmt].append((target, name))
+    return width, height, files
+
+def _save(image, path: Path, fmt: str, quality: int) -> None:
+    if fmt == "jpeg" and image.mode == "RGBA":
+        # JPEG has no alpha channel; flatten onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    image.save(tmp, format=fmt.upper(), quality=quality)
+    os.replace(tmp, path)
+
+class ImagePipeline:
+    """Generates responsive derivatives for project images in a process pool.
+
+    Image paths are resolved against ``source_dir`` (the frontend's public
+    directory by default); remote URLs and missing files are skipped. Results
+    are remembered per source file until it changes on disk.
+    """
+
+    def __init__(
+        self,
+        source_dir: Path,
+        output_dir: Path,
+        widths: Sequence[int] = (320, 640, 1280),
+        formats: Sequence[str] = ("webp", "jpeg"),
+        quality: int = 80,
+        max_workers: int = 2
+    ):
+        self.source_dir = source_dir.resolve()
+        self.output_dir = output_dir
+        self.widths = tuple(widths)
+        self.formats = tuple(formats)
+        self.quality = quality
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._known: Dict[Tuple[str, int, int], ImageVariants] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return Image is not None and self._executor is not None
+
+    def start(self) -> None:
+        if Image is None:
+            logger.warning("Pillow is not installed; image derivatives are disabled")
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    async def stop(self) -> None:
+        if self._executor:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def variants_for(self, images: List[str]) -> Dict[str, ImageVariants]:
+        """Derivatives for each local image in ``images``; failures are logged and skipped."""
+        if not self.enabled:
+            return {}
+        paths = list(dict.fromkeys(images))
+        results = await asyncio.gather(*(self._variants(path) for path in paths))
+        return {path: variants for path, variants in zip(paths, results) if variants is not None}
+
+    async def _variants(self, image: str) -> Optional[ImageVariants]:
+        source = self._resolve(image)
+        if source is None:
+            return None
+        stat = source.stat()
+        key = (str(source), stat.st_mtime_ns, stat.st_size)
+        known = self._known.get(key)
+        if known is not None:
+            return known
+
+        try:
+            width, height, files = await asyncio.get_running_loop().run_in_executor(
+                self._executor, generate_derivatives,
+                str(source), str(self.output_dir), self.widths, self.formats, self.quality
+            )
+        except Exception as e:
+            logger.warning("Could not generate derivatives for %s: %s", image, e)
+            return None
+
+        variants = ImageVariants(
+            width=width,
+            height=height,
+            srcset={
+                MEDIA_TYPES[fmt]: ", ".join(f"{DERIVATIVE_URL_PREFIX}/{name} {w}w" for w, name in entries)
+                for fmt, entries in files.items()
+            }
+        )
+        if len(self._known) >= MAX_KNOWN_IMAGES:
+            self._known.clear()
+        self._known[key] = variants
+        return variants
+
+    def _resolve(self, image: str) -> Optional[Path]:
+        if "://" in image or image.startswith("//"):
+            return None
+        source = (self.source_dir / image.lstrip("/")).resolve()
+        # Only files inside the source directory, whatever the path says
+        if not source.is_relative_to(self.source_dir) or not source.is_file():
+            return None
+        return source
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+import mimetypes
+import os
+import stat
+
+class MediaFile:
+    """An open, read-only file shared by concurrent responses.
+
+    Reads use ``os.pread`` so responses never disturb each other's offset.
+    The descriptor is closed once the file has been evicted from the cache
+    and the last response using it has released it.
+    """
+
+    def __init__(self, path: Path, fd: int, size: int, mtime: float, mtime_ns: int):
+        self.path = path
+        self.fd = fd
+        self.size = size
+        self.mtime = mtime
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        # Strong validator, so it can be used with If-Range
+        self.etag = f'"{mtime_ns:x}-{size:x}"'
+        self._refs = 0
+        self._evicted = False
+
+    def read(self, offset: int, length: int) -> bytes:
+        return os.pread(self.fd, length, offset)
+
+    def _acquire(self) -> "MediaFile":
+        self._refs += 1
+        return self
+
+    def release(self) -> None:
+        self._refs -= 1
+        if self._evicted and self._refs == 0:
+            os.close(self.fd)
+
+    def _evict(self) -> None:
+        self._evicted = True
+        if self._refs == 0:
+            os.close(self.fd)
+
+class MediaStore:
+    """Files under ``root`` with an LRU of at most ``max_open_files`` descriptors.
+
+    Popular videos stay open between requests instead of being reopened for
+    every range a player fetches. A file that changes on disk gets a new
+    descriptor because entries are keyed by modification time and size.
+    """
+
+    def __init__(self, root: Path, max_open_files: int = 64):
+        self.root = root.resolve()
+        self.max_open_files = max_open_files
+        self._files: "OrderedDict[Tuple[str, int, int], MediaFile]" = OrderedDict()
+
+    def open(self, relative_path: str) -> Optional[MediaFile]:
+        """Return an acquired file, or ``None`` if the path is missing or outside the root.
+
+        Callers must ``release()`` the file when they are done with it.
+        """
+        path = (self.root / relative_path.lstrip("/")).resolve()
+        if not path.is_relative_to(self.root) or any(part.startswith(".") for part in path.relative_to(self.root).parts):
+            return None
+        try:
+            info = path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(info.st_mode):
+            return None
+
+        key = (str(path), info.st_mtime_ns, info.st_size)
+        media_file = self._files.get(key)
+        if media_file is not None:
+            self._files.move_to_end(key)
+            return media_file._acquire()
+
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        media_file = MediaFile(path, fd, info.st_size, info.st_mtime, info.st_mtime_ns)
+        self._files[key] = media_file
+        while len(self._files) > self.max_open_files:
+            _, evicted = self._files.popitem(last=False)
+            evicted._evict()
+        return media_file._acquire()
+
+    def close(self) -> None:
+        while self._files:
+            _, media_file = self._files.popitem()
+            media_file._evict()
+
+    def stats(self) -> dict:
+        return {"open_files": len(self._files), "max_open_files": self.max_open_files}
@@ -0,0 +1,254 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Sequence
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+from ..models.contact import Contact
+from ..database.indexes import register_indexes
+from ..utils.fast_json import dumps
+from ..utils.metrics import registry
+import asyncio
+import httpx
+import logging
+import random
+import smtplib
+
+logger = logging.getLogger(__name__)
+
+register_indexes("notification_dead_letters", [
+    IndexModel([("failed_at", ASCENDING)], name="failed_at"),
+])
+
+class NotificationTarget(ABC):
+    """Where notifications about new contacts are delivered.
+
+    ``send`` receives one contact, or several in digest mode, and raises on
+    failure; the dispatcher retries it.
+    """
+
+    name = "target"
+
+    @abstractmethod
+    async def send(self, contacts: List[Contact]) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+class WebhookTarget(NotificationTarget):
+    """POSTs ``{"contacts": [...]}`` as JSON; any non-2xx response is a failure."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self._client = httpx.AsyncClient(timeout=timeout, headers={"Content-Type": "application/json", **(headers or {})})
+
+    async def send(self, contacts: List[Contact]) -> None:
+        body = dumps({"contacts": [contact.model_dump(mode="json") for contact in contacts]})
+        response = await self._client.post(self.url, content=body)
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+class SmtpTarget(NotificationTarget):
+    """Sends one email per delivery, a digest when it covers several contacts.
+
+    ``smtplib`` blocks, so each delivery runs in the default executor.
+    """
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        sender: str,
+        recipients: Sequence[str],
+        port: int = 25,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 10.0
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    async def send(self, contacts: List[Contact]) -> None:
+        message = self._message(contacts)
+        await asyncio.get_running_loop().run_in_executor(None, self._deliver, message)
+
+    def _message(self, contacts: List[Contact]) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        if len(contacts) == 1:
+            message["Subject"] = f"New contact: {contacts[0].subject}"
+            message["Reply-To"] = contacts[0].email
+        else:
+            message["Subject"] = f"{len(contacts)} new contacts"
+        message.set_content("\n\n".join(
+            f"From: {c.name} <{c.email}>\nSubject: {c.subject}\nReceived: {c.created_at:%Y-%m-%d %H:%M} UTC\n\n{c.message}"
+            for c in contacts
+        ))
+        return message
+
+    def _deliver(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+class NotificationDispatcher:
+    """Delivers new-contact notifications from a queue, off the request path.
+
+    ``notify`` never waits: it queues the contact, or drops it when
+    ``max_queue`` notifications are already waiting. ``workers`` tasks take
+    contacts off the queue; with ``digest_size`` above one, a worker gathers
+    up to that many contacts for at most ``digest_window`` seconds and sends
+    them as one notification; ``stop`` cuts that wait short, so a partial
+    digest still goes out on shutdown. Each target is retried independently with
+    exponential backoff and jitter; after ``max_attempts`` the delivery is
+    stored in ``dead_letters`` with the contacts it covered.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[NotificationTarget],
+        dead_letters: AsyncIOMotorCollection,
+        workers: int = 2,
+        digest_size: int = 1,
+        digest_window: float = 60.0,
+        max_queue: int = 10000,
+        max_attempts: int = 5,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.targets = list(targets)
+        self.dead_letters = dead_letters
+        self.workers = workers
+        self.digest_size = digest_size
+        self.digest_window = digest_window
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._tasks: List[asyncio.Task] = []
+        self._closing = False
+        # Accepted by notify() and not yet delivered or dead-lettered, queued or held by a worker
+        self._unsent = 0
+        self._depth = registry.gauge("notification_queue_depth", "Contact notifications waiting for a worker")
+        self._sent = registry.counter("notifications_sent_total", "Notifications delivered", ["target"])
+        self._failed = registry.counter("notifications_dead_lettered_total", "Notifications given up on after retries", ["target"])
+        self._dropped = registry.counter("notifications_dropped_total", "Notifications dropped because the queue was full")
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Give queued notifications ``timeout`` seconds to go out, then stop the workers."""
+        self._closing = True
+        if self._tasks:
+            # One wake-up per worker, so a worker gathering a digest sends what it has
+            for _ in self._tasks:
+                try:
+                    self._queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    break
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("%d contact notifications not sent on shutdown", self._unsent)
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+        for target in self.targets:
+            await target.close()
+
+    def notify(self, contact: Contact) -> None:
+        try:
+            self._queue.put_nowait(contact)
+        except asyncio.QueueFull:
+            self._dropped.inc()
+            logger.warning("Notification queue full; not notifying about contact %s", contact.id)
+            return
+        self._unsent += 1
+        self._depth.set(self._queue.qsize())
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # None is the wake-up sent by stop(), one per worker; everything
+            # queued before it has been taken, so the worker is done
+            contact = await self._queue.get()
+            if contact is None:
+                self._queue.task_done()
+                return
+            batch = [contact]
+            woken = False
+            deadline = loop.time() + self.digest_window
+            while len(batch) < self.digest_size and not self._closing:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    contact = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if contact is None:
+                    woken = True
+                    break
+                batch.append(contact)
+            self._depth.set(self._queue.qsize())
+            try:
+                await asyncio.gather(*(self._deliver(target, batch) for target in self.targets))
+            finally:
+                self._unsent -= len(batch)
+                for _ in range(len(batch) + woken):
+                    self._queue.task_done()
+            if woken:
+                return
+
+    async def _deliver(self, target: NotificationTarget, contacts: List[Contact]) -> None:
+        delay = self.retry_delay
+        error: Optional[Exception] = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await target.send(contacts)
+                self._sent.inc(target.name)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+                if attempt < self.max_attempts:
+                    wait = delay * random.uniform(0.5, 1.5)
+                    logger.info("Notifying %s failed (%s); retry %d in %.1fs", target.name, e, attempt, wait)
+                    await asyncio.sleep(wait)
+                    delay = min(delay * 2, self.max_retry_delay)
+
+        self._failed.inc(target.name)
+        logger.warning("Giving up notifying %s about %d contacts: %s", target.name, len(contacts), error)
+        try:
+            await self.dead_letters.insert_one({
+                "target": target.name,
+                "contacts": [contact.dict() for contact in contacts],
+                "attempts": self.max_attempts,
+                "error": str(error),
+                "failed_at": datetime.utcnow(),
+            })
+        except PyMongoError as e:
+            logger.error("Could not store dead-lettered notification for %s: %s", target.name, e)
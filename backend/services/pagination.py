@@ -0,0 +1,73 @@
+import base64
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Listings are ordered newest first; ``id`` breaks ties between documents
+# created in the same millisecond so every document has a stable position.
+SORT_ORDER = [("created_at", -1), ("id", -1)]
+
+MAX_PAGE_SIZE = 100
+
+class PaginationError(ValueError):
+    """Raised for malformed listing parameters (bad cursor, unknown field)."""
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ``PaginationError`` for malformed cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), item_id
+    except Exception:
+        raise PaginationError("Invalid cursor")
+
+def after_filter(cursor: Optional[str]) -> Dict[str, Any]:
+    """Build the keyset condition selecting documents that sort after ``cursor``."""
+    if not cursor:
+        return {}
+    created_at, item_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": item_id}},
+        ]
+    }
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """Parse a comma separated ``fields=`` parameter.
+
+    ``id`` and ``created_at`` are always included because the next cursor is
+    built from them. Raises ``PaginationError`` for unknown field names.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - set(allowed)
+    if unknown:
+        raise PaginationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return list(dict.fromkeys(["id", "created_at", *requested]))
+
+def parse_list(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    return items or None
+
+def projection_for(fields: Optional[List[str]]) -> Dict[str, int]:
+    if fields is None:
+        return {"_id": 0}
+    return {"_id": 0, **{f: 1 for f in fields}}
+
+def next_cursor(items: List[Any], limit: Optional[int], has_more: bool) -> Optional[str]:
+    if not limit or not has_more or not items:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
@@ -1,12 +1,22 @@
 from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReturnDocument
 from ..models.personal_info import PersonalInfo, PersonalInfoCreate, PersonalInfoUpdate
+from ..database.indexes import register_indexes
+from .versioning import VersionConflictError, version_filter, versioned_update
+from .document_cache import WatchedDocument
 from datetime import datetime
 
+register_indexes("personal_info", [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+])
+
 class PersonalInfoService:
-    def __init__(self, database: AsyncIOMotorDatabase):
+    def __init__(self, database: AsyncIOMotorDatabase, cache: Optional[WatchedDocument] = None):
         self.database = database
         self.collection = database.personal_info
+        # Optional in-memory copy of the singleton document, kept fresh across workers
+        self.cache = cache
 
     async def create_or_update_personal_info(self, personal_info_data: PersonalInfoCreate) -> PersonalInfo:
         personal_info = PersonalInfo(**personal_info_data.dict())
@@ -14,37 +24,58 @@ class PersonalInfoService:
         # Convert to dict for MongoDB insertion
         personal_info_dict = personal_info.dict()
         
-        # Use upsert to create or update
-        await self.collection.replace_one(
+        # Upsert and bump the version in one round trip
+        personal_info_dict = await self.collection.find_one_and_update(
             {"id": "personal_info"},
-            personal_info_dict,
-            upsert=True
+            versioned_update(personal_info_dict, None),
+            upsert=True,
+            return_document=ReturnDocument.AFTER
         )
         
-        return personal_info
+        return self._remember(PersonalInfo(**personal_info_dict))
 
     async def get_personal_info(self) -> Optional[PersonalInfo]:
+        if self.cache is not None:
+            return await self.cache.get()
         personal_info_dict = await self.collection.find_one({"id": "personal_info"})
         if personal_info_dict:
             return PersonalInfo(**personal_info_dict)
         return None
 
-    async def update_personal_info(self, personal_info_data: PersonalInfoUpdate) -> Optional[PersonalInfo]:
-        # Get existing personal info
-        existing_info = await self.get_personal_info()
-        if not existing_info:
-            return None
-        
-        # Update fields
+    async def update_personal_info(
+        self,
+        personal_info_data: PersonalInfoUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[PersonalInfo]:
+        """Apply a partial update in a single round trip.
+
+        With ``expected_version`` set the write only succeeds if the stored
+        document is still at that version; otherwise ``VersionConflictError``
+        is raised. Returns ``None`` if no personal info exists.
+        """
         update_data = personal_info_data.dict(exclude_unset=True)
-        if update_data:
-            update_data["updated_at"] = datetime.utcnow()
-            
-            # Update in database
-            await self.collection.update_one(
-                {"id": "personal_info"},
-                {"$set": update_data}
-            )
-        
-        # Return updated personal info
-        return await self.get_personal_info()
\ No newline at end of file
+        if not update_data:
+            current = await self.get_personal_info()
+            if current and expected_version is not None and current.version != expected_version:
+                raise VersionConflictError(current.version)
+            return current
+
+        update_data["updated_at"] = datetime.utcnow()
+        personal_info_dict = await self.collection.find_one_and_update(
+            {"id": "personal_info", **version_filter(expected_version)},
+            versioned_update(update_data, expected_version),
+            return_document=ReturnDocument.AFTER
+        )
+        if personal_info_dict is None:
+            if expected_version is not None:
+                current = await self.get_personal_info()
+                if current:
+                    raise VersionConflictError(current.version)
+            return None
+
+        return self._remember(PersonalInfo(**personal_info_dict))
+
+    def _remember(self, personal_info: PersonalInfo) -> PersonalInfo:
+        if self.cache is not None:
+            self.cache.set(personal_info)
+        return personal_info
@@ -0,0 +1,58 @@
+from typing import Optional
+from ..models.portfolio import Portfolio
+from ..utils.fast_json import SerializedDocument
+from ..utils.http_cache import list_etag
+from .cache import TTLCache
+from .personal_info_service import PersonalInfoService
+from .project_service import ProjectService
+from .skill_service import SkillService
+import asyncio
+
+class PortfolioService:
+    """Everything the homepage renders, assembled into one cached response.
+
+    The three parts are fetched concurrently, each from its own cache. The
+    assembled portfolio is cached under the versions of those parts, so a
+    write to any of them (including personal info changes made by another
+    worker) yields a new entry without explicit invalidation.
+    """
+
+    def __init__(
+        self,
+        personal_info_service: PersonalInfoService,
+        project_service: ProjectService,
+        skill_service: SkillService,
+        cache: Optional[TTLCache] = None
+    ):
+        self.personal_info_service = personal_info_service
+        self.project_service = project_service
+        self.skill_service = skill_service
+        self.cache = cache if cache is not None else TTLCache(ttl=0)
+
+    async def get_portfolio(self) -> SerializedDocument:
+        personal_info, featured_projects, skills = await asyncio.gather(
+            self.personal_info_service.get_personal_info(),
+            self.project_service.get_project_listing(featured_only=True),
+            self.skill_service.get_skill_listing()
+        )
+
+        key = (
+            getattr(personal_info, "version", None),
+            getattr(personal_info, "updated_at", None),
+            featured_projects.etag,
+            skills.etag,
+        )
+        portfolio = self.cache.get(key)
+        if portfolio is None:
+            portfolio = SerializedDocument(
+                Portfolio(
+                    personal_info=personal_info,
+                    featured_projects=featured_projects.items,
+                    skills=skills.items
+                ),
+                # No Last-Modified: removing a featured project or skill
+                # category does not advance any updated_at
+                list_etag((), *key)
+            )
+            self.cache.set(key, portfolio)
+        return portfolio
@@ -1,26 +1,136 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from ..models.project import Project, ProjectCreate, ProjectUpdate
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError
+from pydantic import ValidationError
+from ..models.project import ImageVariants, Project, ProjectCreate, ProjectUpdate
+from ..models.bulk import BulkItemError, BulkResult
+from ..models.facet import TechnologyFacet
+from ..utils.ndjson import stream_cursor
+from ..utils.fast_json import SerializedListing
+from .cache import TTLCache
+from .search_index import ProjectSearchIndex
+from .facet_index import TechnologyFacetIndex
+from .image_pipeline import ImagePipeline
+from .pagination import SORT_ORDER, after_filter, next_cursor, projection_for
+from .versioning import VersionConflictError, version_filter, versioned_update
+from ..database.indexes import register_indexes
 from datetime import datetime
+import asyncio
 import uuid
 
+register_indexes("projects", [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    IndexModel([("featured", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="featured_created_at_id"),
+    # Multikey: one entry per technology, serving technologies= filters in listing order
+    IndexModel([("technologies", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="technologies_created_at_id"),
+    IndexModel(
+        [("title", TEXT), ("short_description", TEXT), ("description", TEXT), ("technologies", TEXT)],
+        name="project_text",
+        weights={"title": 10, "technologies": 5, "short_description": 3, "description": 1}
+    ),
+])
+
 class ProjectService:
-    def __init__(self, database: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase,
+        cache: Optional[TTLCache] = None,
+        search_index: Optional[ProjectSearchIndex] = None,
+        facet_index: Optional[TechnologyFacetIndex] = None,
+        image_pipeline: Optional[ImagePipeline] = None
+    ):
         self.database = database
         self.collection = database.projects
+        # List reads are served from the cache; every mutation invalidates it
+        self.cache = cache if cache is not None else TTLCache(ttl=0)
+        # In-memory indexes, updated by every mutation and rebuilt by refresh_indexes()
+        self.search_index = search_index if search_index is not None else ProjectSearchIndex()
+        self.facet_index = facet_index if facet_index is not None else TechnologyFacetIndex()
+        self._indexes = [self.search_index, self.facet_index]
+        # Generates responsive image derivatives before a project is stored
+        self.image_pipeline = image_pipeline
+        # Bumped by every index update, to detect writes racing a rebuild
+        self._index_updates = 0
 
     async def create_project(self, project_data: ProjectCreate) -> Project:
         project = Project(**project_data.dict())
+        project.image_variants = await self._image_variants(project.images)
         
         # Convert to dict for MongoDB insertion
         project_dict = project.dict()
         
         # Insert into database
         result = await self.collection.insert_one(project_dict)
+        self.cache.invalidate()
+        self._index(project)
         
         # Return the created project
         return project
 
+    async def create_projects(self, items: List[Dict[str, Any]], ordered: bool = True) -> BulkResult:
+        """Insert many projects with a single ``insert_many``.
+
+        Items may be full exported documents (their ``id`` and timestamps are
+        kept) or plain create payloads. In ordered mode processing stops at the
+        first failing item; in unordered mode every valid item is inserted.
+        Failures are reported per item by their index in ``items``.
+        """
+        errors: List[BulkItemError] = []
+        documents: List[dict] = []
+        indexes: List[int] = []
+
+        for index, item in enumerate(items):
+            try:
+                documents.append(Project(**item).dict())
+                indexes.append(index)
+            except ValidationError as e:
+                errors.append(BulkItemError(index=index, error=_validation_message(e)))
+                if ordered:
+                    break
+
+        variants = await asyncio.gather(*(self._image_variants(d["images"]) for d in documents))
+        for document, image_variants in zip(documents, variants):
+            document["image_variants"] = {path: v.dict() for path, v in image_variants.items()}
+
+        # In ordered mode nothing after an invalid item is attempted
+        skipped_from = len(documents) + len(errors) if ordered and errors else len(items)
+
+        failed: Dict[int, str] = {}
+        attempted = len(documents)
+        if documents:
+            try:
+                await self.collection.insert_many(documents, ordered=ordered)
+            except BulkWriteError as e:
+                for write_error in e.details.get("writeErrors", []):
+                    failed[write_error["index"]] = write_error.get("errmsg", "Write failed")
+                if ordered and failed:
+                    attempted = min(failed) + 1
+
+        inserted_ids = []
+        for position, document in enumerate(documents):
+            if position in failed:
+                errors.append(BulkItemError(index=indexes[position], error=failed[position]))
+            elif position >= attempted:
+                errors.append(BulkItemError(index=indexes[position], error="Not processed: an earlier item failed"))
+            else:
+                inserted_ids.append(document["id"])
+                self._index(Project(**document))
+
+        for index in range(skipped_from, len(items)):
+            errors.append(BulkItemError(index=index, error="Not processed: an earlier item failed"))
+
+        if inserted_ids:
+            self.cache.invalidate()
+        errors.sort(key=lambda error: error.index)
+        return BulkResult(inserted_count=len(inserted_ids), inserted_ids=inserted_ids, errors=errors)
+
+    def export_projects(self) -> AsyncIterator[bytes]:
+        """Stream every stored project as NDJSON without materializing a list."""
+        cursor = self.collection.find({}, {"_id": 0}).sort(SORT_ORDER).batch_size(500)
+        return stream_cursor(cursor)
+
     async def get_project(self, project_id: str) -> Optional[Project]:
         project_dict = await self.collection.find_one({"id": project_id})
         if project_dict:
@@ -28,37 +138,179 @@ class ProjectService:
         return None
 
     async def get_all_projects(self) -> List[Project]:
-        projects = []
-        async for project_dict in self.collection.find().sort("created_at", -1):
-            projects.append(Project(**project_dict))
-        return projects
+        listing = await self.get_project_listing()
+        return list(listing.items)
 
-    async def update_project(self, project_id: str, project_data: ProjectUpdate) -> Optional[Project]:
-        # Get existing project
-        existing_project = await self.get_project(project_id)
-        if not existing_project:
-            return None
-        
-        # Update fields
-        update_data = project_data.dict(exclude_unset=True)
-        if update_data:
-            update_data["updated_at"] = datetime.utcnow()
-            
-            # Update in database
-            await self.collection.update_one(
-                {"id": project_id},
-                {"$set": update_data}
+    async def get_project_listing(self, featured_only: bool = False) -> SerializedListing:
+        """Return the cached full (or featured) listing with its memoized ETag and JSON body."""
+        if featured_only:
+            return await self.cache.get_or_load(
+                "featured", lambda: self._load_listing({"featured": True})
             )
-        
-        # Return updated project
-        return await self.get_project(project_id)
+        return await self.cache.get_or_load("all", lambda: self._load_listing({}))
+
+    async def list_projects(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        technologies: Optional[List[str]] = None,
+        featured: Optional[bool] = None,
+        tech: Optional[List[str]] = None,
+        tech_match_all: bool = True
+    ) -> Tuple[List[Union[Project, dict]], Optional[str]]:
+        """Return one page of projects and the cursor for the next page.
+
+        With ``fields`` set, items are plain dicts holding only those fields.
+        ``technologies`` matches stored values exactly; ``tech`` matches
+        normalized tags through the facet index.
+        """
+        query = after_filter(after)
+        if technologies:
+            query["technologies"] = {"$all": technologies}
+        if featured is not None:
+            query["featured"] = featured
+        if tech:
+            project_ids = self.facet_index.match(tech, tech_match_all)
+            if not project_ids:
+                return [], None
+            query["id"] = {"$in": sorted(project_ids)}
+
+        key = (
+            "page", limit, after,
+            tuple(fields) if fields else None,
+            tuple(technologies) if technologies else None,
+            featured,
+            tuple(tech) if tech else None,
+            tech_match_all
+        )
+        items, cursor = await self.cache.get_or_load(
+            key, lambda: self._find_page(query, limit, fields)
+        )
+        return list(items), cursor
+
+    async def update_project(
+        self,
+        project_id: str,
+        project_data: ProjectUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[Project]:
+        """Apply a partial update in a single round trip.
+
+        With ``expected_version`` set the write only succeeds if the stored
+        document is still at that version; otherwise ``VersionConflictError``
+        is raised. Returns ``None`` if the project does not exist.
+        """
+        update_data = project_data.dict(exclude_unset=True)
+        if not update_data:
+            current = await self.get_project(project_id)
+            if current and expected_version is not None and current.version != expected_version:
+                raise VersionConflictError(current.version)
+            return current
+
+        if "images" in update_data:
+            image_variants = await self._image_variants(update_data["images"])
+            update_data["image_variants"] = {path: v.dict() for path, v in image_variants.items()}
+
+        update_data["updated_at"] = datetime.utcnow()
+        project_dict = await self.collection.find_one_and_update(
+            {"id": project_id, **version_filter(expected_version)},
+            versioned_update(update_data, expected_version),
+            return_document=ReturnDocument.AFTER
+        )
+        if project_dict is None:
+            if expected_version is not None:
+                current = await self.get_project(project_id)
+                if current:
+                    raise VersionConflictError(current.version)
+            return None
+
+        self.cache.invalidate()
+        project = Project(**project_dict)
+        self._index(project)
+        return project
 
     async def delete_project(self, project_id: str) -> bool:
         result = await self.collection.delete_one({"id": project_id})
+        if result.deleted_count > 0:
+            self.cache.invalidate()
+            self._index_updates += 1
+            for index in self._indexes:
+                index.remove(project_id)
         return result.deleted_count > 0
 
+    def technology_facets(self) -> List[TechnologyFacet]:
+        return self.facet_index.facets()
+
+    async def filter_by_technology(self, tech: List[str], match_all: bool = True) -> List[Project]:
+        """Projects tagged with all (or any) of ``tech``, taken from the cached full listing."""
+        project_ids = self.facet_index.match(tech, match_all)
+        if not project_ids:
+            return []
+        listing = await self.get_project_listing()
+        return [project for project in listing.items if project.id in project_ids]
+
+    def search_projects(self, query: str, limit: int = 20) -> List[Project]:
+        """Rank projects against ``query`` from the in-memory search index."""
+        return self.search_index.search(query, limit)
+
+    async def refresh_indexes(self) -> None:
+        """Rebuild the in-memory indexes from the collection.
+
+        Run at startup and periodically, so writes made by other workers are
+        picked up; this worker's own writes are applied immediately. A load
+        that overlaps a local write is retried so the write is not lost.
+        """
+        for _ in range(3):
+            updates = self._index_updates
+            projects = await self._find_projects({})
+            if updates == self._index_updates:
+                break
+        for index in self._indexes:
+            index.rebuild(projects)
+
     async def get_featured_projects(self) -> List[Project]:
+        listing = await self.get_project_listing(featured_only=True)
+        return list(listing.items)
+
+    async def _image_variants(self, images: List[str]) -> Dict[str, ImageVariants]:
+        if self.image_pipeline is None:
+            return {}
+        return await self.image_pipeline.variants_for(images)
+
+    def _index(self, project: Project) -> None:
+        self._index_updates += 1
+        for index in self._indexes:
+            index.add(project)
+
+    async def _load_listing(self, query: dict) -> SerializedListing:
+        return SerializedListing(await self._find_projects(query))
+
+    async def _find_projects(self, query: dict) -> List[Project]:
         projects = []
-        async for project_dict in self.collection.find({"featured": True}).sort("created_at", -1):
+        async for project_dict in self.collection.find(query).sort(SORT_ORDER):
             projects.append(Project(**project_dict))
-        return projects
\ No newline at end of file
+        return projects
+
+    async def _find_page(
+        self, query: dict, limit: Optional[int], fields: Optional[List[str]]
+    ) -> Tuple[List[Union[Project, dict]], Optional[str]]:
+        cursor = self.collection.find(query, projection_for(fields)).sort(SORT_ORDER)
+        if limit:
+            # Fetch one extra document to know whether another page exists
+            cursor = cursor.limit(limit + 1)
+
+        items = []
+        async for project_dict in cursor:
+            items.append(project_dict if fields else Project(**project_dict))
+
+        has_more = bool(limit) and len(items) > limit
+        if has_more:
+            items = items[:limit]
+        return items, next_cursor(items, limit, has_more)
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
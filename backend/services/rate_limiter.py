@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from ..database.indexes import register_indexes
+import json
+import math
+import time
+
+register_indexes("rate_limits", [
+    IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+])
+
+class Rate(NamedTuple):
+    """``capacity`` requests per ``period`` seconds."""
+    capacity: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        capacity, period = value.split("/", 1)
+        return cls(int(capacity), float(period))
+
+def parse_rules(value: str) -> Dict[Tuple[str, str], Dict[str, Rate]]:
+    """Parse rate limit rules from JSON.
+
+    Example: ``{"POST /api/contacts": {"ip": "5/60", "email": "3/3600"}}``
+    limits each client IP to 5 requests a minute and each email address to
+    3 an hour on that route.
+    """
+    rules = {}
+    for route, limits in json.loads(value).items():
+        method, path = route.split(" ", 1)
+        rules[(method.upper(), path)] = {key: Rate.parse(rate) for key, rate in limits.items()}
+    return rules
+
+class TokenBucketLimiter:
+    """In-process token buckets with LRU eviction of idle keys.
+
+    All state changes happen synchronously on the event loop, so no locking
+    is needed. Each process enforces its limits independently.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        """Take one token for ``key``. Returns 0 if allowed, else seconds until retry."""
+        now = time.monotonic()
+        refill = rate.capacity / rate.period
+        tokens, updated = self._buckets.get(key, (float(rate.capacity), now))
+        tokens = min(float(rate.capacity), tokens + (now - updated) * refill)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / refill
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+class MongoRateLimiter:
+    """Fixed-window counters in MongoDB, shared by every worker.
+
+    One atomic ``find_one_and_update`` per check; expired windows are removed
+    by a TTL index.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        now = time.time()
+        window = math.floor(now / rate.period)
+        window_end = (window + 1) * rate.period
+        counter = await self.collection.find_one_and_update(
+            {"_id": f"{key}:{window}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {"expires_at": datetime.utcfromtimestamp(window_end) + timedelta(seconds=1)},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if counter["count"] > rate.capacity:
+            return window_end - now
+        return 0.0
@@ -0,0 +1,166 @@
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional
+from ..models.project import Project
+import heapq
+import math
+import re
+
+# Field weights: a term in the title counts three times one in the description
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "technologies": 2.0,
+    "short_description": 1.5,
+    "description": 1.0,
+}
+
+# Prefix expansions of the last query term score lower than exact matches
+PREFIX_BOOST = 0.5
+MAX_PREFIX_EXPANSIONS = 64
+
+# Recent result lists, reused until the index next changes
+MAX_CACHED_QUERIES = 256
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+class ProjectSearchIndex:
+    """In-memory inverted index over projects, ranked with BM25.
+
+    Postings map each term to the weighted term frequency per project. The
+    vocabulary is also kept sorted so the last query term can be expanded
+    to every indexed term it prefixes, which is what typeahead needs.
+    Updates are incremental: ``add`` replaces a project's postings and
+    ``remove`` drops them. Typeahead sends the same prefixes over and over,
+    so recent results are kept until the next update.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: List[str] = []
+        self._lengths: Dict[str, float] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._projects: Dict[str, Project] = {}
+        self._total_length = 0.0
+        self._norms: Optional[Dict[str, float]] = None
+        self._results: "OrderedDict[tuple, List[Project]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._projects)
+
+    def rebuild(self, projects: Iterable[Project]) -> None:
+        self._postings = {}
+        self._terms = []
+        self._lengths = {}
+        self._doc_terms = {}
+        self._projects = {}
+        self._total_length = 0.0
+        self._changed()
+        for project in projects:
+            self.add(project)
+
+    def add(self, project: Project) -> None:
+        if project.id in self._projects:
+            self.remove(project.id)
+
+        frequencies: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = getattr(project, field)
+            text = " ".join(value) if isinstance(value, list) else value or ""
+            for term in tokenize(text):
+                frequencies[term] += weight
+
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[project.id] = frequency
+
+        length = sum(frequencies.values())
+        self._lengths[project.id] = length
+        self._doc_terms[project.id] = list(frequencies)
+        self._total_length += length
+        self._projects[project.id] = project
+        self._changed()
+
+    def remove(self, project_id: str) -> None:
+        project = self._projects.pop(project_id, None)
+        if project is None:
+            return
+        self._total_length -= self._lengths.pop(project_id)
+        self._changed()
+        for term in self._doc_terms.pop(project_id):
+            postings = self._postings[term]
+            del postings[project_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def search(self, query: str, limit: int = 20) -> List[Project]:
+        """Return the best matching projects for ``query``, highest score first."""
+        terms = tokenize(query)
+        if not terms or not self._projects:
+            return []
+
+        prefix = not query[-1:].isspace()
+        key = (tuple(terms), prefix, limit)
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            return cached
+
+        weighted = {term: 1.0 for term in terms}
+        # Typeahead: the term being typed also matches longer indexed terms
+        if prefix:
+            for term in self._expand(terms[-1]):
+                weighted.setdefault(term, PREFIX_BOOST)
+
+        scores: Dict[str, float] = {}
+        count = len(self._projects)
+        norms = self._length_norms()
+        for term, boost in weighted.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weight = boost * idf * (self.k1 + 1)
+            get = scores.get
+            for project_id, frequency in postings.items():
+                scores[project_id] = get(project_id, 0.0) + weight * frequency / (frequency + norms[project_id])
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = [self._projects[project_id] for project_id, _ in best]
+        self._results[key] = results
+        if len(self._results) > MAX_CACHED_QUERIES:
+            self._results.popitem(last=False)
+        return results
+
+    def _changed(self) -> None:
+        self._norms = None
+        self._results.clear()
+
+    def _length_norms(self) -> Dict[str, float]:
+        """BM25 length normalisation per project, recomputed only after the index changes."""
+        if self._norms is None:
+            average_length = self._total_length / len(self._projects) or 1.0
+            k1, b = self.k1, self.b
+            self._norms = {
+                project_id: k1 * (1 - b + b * length / average_length)
+                for project_id, length in self._lengths.items()
+            }
+        return self._norms
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect_left(self._terms, prefix)
+        expansions = []
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            if term != prefix:
+                expansions.append(term)
+        return expansions
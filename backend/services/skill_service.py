@@ -0,0 +1,94 @@
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from ..models.skill import SkillCategory, SkillCategoryCreate, SkillCategoryUpdate
+from ..utils.fast_json import SerializedListing
+from ..database.indexes import register_indexes
+from .cache import TTLCache
+from .versioning import VersionConflictError, version_filter, versioned_update
+from datetime import datetime
+
+# Categories are shown in the order they were added
+SKILL_ORDER = [("created_at", ASCENDING), ("id", ASCENDING)]
+
+register_indexes("skills", [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel(SKILL_ORDER, name="created_at_id"),
+])
+
+class SkillService:
+    def __init__(self, database: AsyncIOMotorDatabase, cache: Optional[TTLCache] = None):
+        self.database = database
+        self.collection = database.skills
+        # The full listing is served from the cache; every mutation invalidates it
+        self.cache = cache if cache is not None else TTLCache(ttl=0)
+
+    async def create_skill_category(self, skill_category_data: SkillCategoryCreate) -> SkillCategory:
+        skill_category = SkillCategory(**skill_category_data.dict())
+        
+        # Convert to dict for MongoDB insertion
+        await self.collection.insert_one(skill_category.dict())
+        self.cache.invalidate()
+        
+        return skill_category
+
+    async def get_skill_category(self, category_id: str) -> Optional[SkillCategory]:
+        skill_category_dict = await self.collection.find_one({"id": category_id})
+        if skill_category_dict:
+            return SkillCategory(**skill_category_dict)
+        return None
+
+    async def get_all_skill_categories(self) -> List[SkillCategory]:
+        listing = await self.get_skill_listing()
+        return list(listing.items)
+
+    async def get_skill_listing(self) -> SerializedListing:
+        """Return the cached listing of all categories with its memoized ETag and JSON body."""
+        return await self.cache.get_or_load("all", self._load_listing)
+
+    async def update_skill_category(
+        self,
+        category_id: str,
+        skill_category_data: SkillCategoryUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[SkillCategory]:
+        """Apply a partial update in a single round trip.
+
+        With ``expected_version`` set the write only succeeds if the stored
+        document is still at that version; otherwise ``VersionConflictError``
+        is raised. Returns ``None`` if the category does not exist.
+        """
+        update_data = skill_category_data.dict(exclude_unset=True)
+        if not update_data:
+            current = await self.get_skill_category(category_id)
+            if current and expected_version is not None and current.version != expected_version:
+                raise VersionConflictError(current.version)
+            return current
+
+        update_data["updated_at"] = datetime.utcnow()
+        skill_category_dict = await self.collection.find_one_and_update(
+            {"id": category_id, **version_filter(expected_version)},
+            versioned_update(update_data, expected_version),
+            return_document=ReturnDocument.AFTER
+        )
+        if skill_category_dict is None:
+            if expected_version is not None:
+                current = await self.get_skill_category(category_id)
+                if current:
+                    raise VersionConflictError(current.version)
+            return None
+
+        self.cache.invalidate()
+        return SkillCategory(**skill_category_dict)
+
+    async def delete_skill_category(self, category_id: str) -> bool:
+        result = await self.collection.delete_one({"id": category_id})
+        if result.deleted_count > 0:
+            self.cache.invalidate()
+        return result.deleted_count > 0
+
+    async def _load_listing(self) -> SerializedListing:
+        skill_categories = []
+        async for skill_category_dict in self.collection.find({}).sort(SKILL_ORDER):
+            skill_categories.append(SkillCategory(**skill_category_dict))
+        return SerializedListing(skill_categories)
@@ -0,0 +1,236 @@
+from collections import deque
+from hashlib import blake2b
+from typing import Deque, Dict, List, NamedTuple, Optional, Set
+from ..models.contact import Contact
+from operator import add
+import math
+import re
+import time
+
+TOKEN_RE = re.compile(r"\w+")
+LINK_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+SPAM_TERMS = {
+    "casino", "crypto", "bitcoin", "viagra", "loan", "seo", "backlinks", "porn",
+    "forex", "investment", "winner", "prize", "unsubscribe", "guaranteed", "cheap",
+}
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+
+# Maps the ASCII digits of a binary string to 0 and 1
+_BIT_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+# Words summed per byte lane before the lanes could overflow
+_LANE_LIMIT = 255
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the words in ``text``; similar texts differ in few bits.
+
+    Each word hash is spread to one byte per bit, so a single big-integer
+    addition counts all 64 bits at once.
+    """
+    words = TOKEN_RE.findall(text.lower())
+    ones = [0] * 64
+    for start in range(0, len(words), _LANE_LIMIT):
+        lanes = 0
+        for word in words[start:start + _LANE_LIMIT]:
+            lanes += int.from_bytes(format(_hash64(word), "064b").encode().translate(_BIT_VALUES), "big")
+        ones = list(map(add, ones, lanes.to_bytes(64, "big")))
+    half = len(words) / 2
+    return int("".join("1" if count > half else "0" for count in ones), 2)
+
+class _Fingerprint(NamedTuple):
+    value: int
+    contact_id: str
+    email: str
+    seen_at: float
+
+class SimHashIndex:
+    """Recent message fingerprints, searchable by Hamming distance.
+
+    Each 64-bit fingerprint is split into ``max_distance + 1`` bands; two
+    fingerprints within ``max_distance`` bits must agree on at least one
+    band, so a lookup only compares against entries sharing a band.
+    Entries expire after ``window`` seconds or when ``max_entries`` is
+    exceeded, oldest first.
+    """
+
+    def __init__(self, max_entries: int = 10000, window: float = 86400.0, max_distance: int = 6):
+        self.max_entries = max_entries
+        self.window = window
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._band_bits = 64 // self._bands
+        self._entries: Deque[_Fingerprint] = deque()
+        self._buckets: List[Dict[int, Set[_Fingerprint]]] = [{} for _ in range(self._bands)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, value: int, now: float) -> Optional[_Fingerprint]:
+        self._expire(now)
+        best = None
+        for band, key in enumerate(self._keys(value)):
+            for entry in self._buckets[band].get(key, ()):
+                distance = (entry.value ^ value).bit_count()
+                if distance <= self.max_distance and (best is None or entry.seen_at > best.seen_at):
+                    best = entry
+        return best
+
+    def add(self, value: int, contact_id: str, email: str, now: float) -> None:
+        entry = _Fingerprint(value, contact_id, email, now)
+        self._entries.append(entry)
+        for band, key in enumerate(self._keys(value)):
+            self._buckets[band].setdefault(key, set()).add(entry)
+        while len(self._entries) > self.max_entries:
+            self._drop(self._entries.popleft())
+
+    def _keys(self, value: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [value >> (band * self._band_bits) & mask for band in range(self._bands)]
+
+    def _expire(self, now: float) -> None:
+        while self._entries and now - self._entries[0].seen_at > self.window:
+            self._drop(self._entries.popleft())
+
+    def _drop(self, entry: _Fingerprint) -> None:
+        for band, key in enumerate(self._keys(entry.value)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(entry)
+                if not bucket:
+                    del self._buckets[band][key]
+
+class BloomFilter:
+    """Fixed-size Bloom filter; false positives at roughly ``error_rate`` when full."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & 1 << (p & 7) for p in self._positions(key))
+
+    def _positions(self, key: str):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+class RotatingBloomFilter:
+    """Keys seen within the last ``window`` to ``2 * window`` seconds.
+
+    Two filters take turns: lookups check both, inserts go to the current
+    one, and every ``window`` seconds the older filter is discarded.
+    """
+
+    def __init__(self, capacity: int, window: float, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.window = window
+        self.error_rate = error_rate
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+
+    def add(self, key: str, now: float) -> None:
+        self._rotate(now)
+        self._current.add(key)
+
+    def seen(self, key: str, now: float) -> bool:
+        self._rotate(now)
+        return key in self._current or key in self._previous
+
+    def _rotate(self, now: float) -> None:
+        if now - self._rotated_at >= self.window:
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = now
+
+def heuristic_score(contact: Contact) -> float:
+    """Cheap content signals, from 0 (clean) to 1 (certainly spam)."""
+    text = f"{contact.subject} {contact.message}"
+    words = TOKEN_RE.findall(text.lower())
+    score = 0.0
+
+    links = len(LINK_RE.findall(text))
+    score += min(links, 4) * 0.15
+    if words:
+        spam_words = sum(1 for word in words if word in SPAM_TERMS)
+        score += min(spam_words / len(words) * 4, 0.4)
+    letters = [c for c in contact.message if c.isalpha()]
+    if len(letters) >= 20 and sum(c.isupper() for c in letters) / len(letters) > 0.6:
+        score += 0.2
+    if re.search(r"(.)\1{9,}", contact.message):
+        score += 0.2
+    if len(contact.message.strip()) < 5:
+        score += 0.2
+    if sum(c.isdigit() for c in contact.email.split("@")[0]) >= 5:
+        score += 0.1
+    return min(score, 1.0)
+
+class SpamVerdict(NamedTuple):
+    # "accept", "flag", "collapse" or "drop"
+    action: str
+    reasons: List[str]
+    duplicate_of: Optional[str] = None
+
+class SpamFilter:
+    """Pre-insert screening for contact submissions.
+
+    * Near-duplicates of a recent message from the same sender are
+      collapsed into the original; from another sender they are flagged.
+    * A recently seen ``(email, subject)`` pair is flagged.
+    * Submissions whose heuristic score reaches ``drop_score`` are dropped;
+      reaching ``flag_score`` they are flagged.
+
+    Memory is bounded by ``max_messages`` fingerprints and two Bloom filters
+    sized for the same number of keys.
+    """
+
+    def __init__(
+        self,
+        max_messages: int = 10000,
+        window: float = 86400.0,
+        max_distance: int = 6,
+        flag_score: float = 0.5,
+        drop_score: float = 0.8
+    ):
+        self.flag_score = flag_score
+        self.drop_score = drop_score
+        self.messages = SimHashIndex(max_messages, window, max_distance)
+        self.senders = RotatingBloomFilter(max_messages, window / 2)
+
+    def check(self, contact: Contact) -> SpamVerdict:
+        """Classify ``contact`` and, unless it is dropped or collapsed, remember it."""
+        now = time.monotonic()
+        email = contact.email.lower()
+        reasons: List[str] = []
+
+        score = heuristic_score(contact)
+        if score >= self.drop_score:
+            return SpamVerdict("drop", [f"score:{score:.2f}"])
+        if score >= self.flag_score:
+            reasons.append(f"score:{score:.2f}")
+
+        fingerprint = simhash(contact.message)
+        duplicate = self.messages.find(fingerprint, now)
+        if duplicate is not None:
+            if duplicate.email == email:
+                return SpamVerdict("collapse", ["duplicate"], duplicate.contact_id)
+            reasons.append("near_duplicate")
+
+        sender_key = f"{email}\x00{contact.subject.strip().lower()}"
+        if self.senders.seen(sender_key, now):
+            reasons.append("repeated_subject")
+
+        # A cluster of near-duplicates keeps only its first member, so bucket
+        # sizes stay bounded however often one message is resent
+        if duplicate is None:
+            self.messages.add(fingerprint, contact.id, email, now)
+        self.senders.add(sender_key, now)
+        return SpamVerdict("flag" if reasons else "accept", reasons)
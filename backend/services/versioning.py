@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional, Union
+
+class VersionConflictError(Exception):
+    """Raised when a conditional update targets an outdated document version."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Document has been modified (current version {current_version})")
+        self.current_version = current_version
+
+def version_filter(expected_version: Optional[int]) -> Dict[str, Any]:
+    """Match documents at ``expected_version``.
+
+    Documents written before versioning was introduced have no ``version``
+    field and are read as version 1, so version 1 also matches a missing field.
+    """
+    if expected_version is None:
+        return {}
+    if expected_version == 1:
+        return {"version": {"$in": [1, None]}}
+    return {"version": expected_version}
+
+def versioned_update(fields: Dict[str, Any], expected_version: Optional[int]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Build an update that sets ``fields`` and advances the version.
+
+    Without an expected version the update is a pipeline, so a document
+    with no ``version`` field (read as 1) is moved to 2 rather than having
+    ``$inc`` store 1 again; a document created by an upsert starts at 2,
+    which is fine as versions only need to increase. Values are wrapped in
+    ``$literal`` so strings starting with ``$`` are not read as field paths.
+    """
+    fields = {k: v for k, v in fields.items() if k != "version"}
+    if expected_version is None:
+        return [{"$set": {
+            **{k: {"$literal": v} for k, v in fields.items()},
+            "version": {"$add": [{"$ifNull": ["$version", 1]}, 1]},
+        }}]
+    return {"$set": {**fields, "version": expected_version + 1}}
+
+def parse_if_match(header: Optional[str]) -> Optional[int]:
+    """Extract the expected version from an ``If-Match`` header.
+
+    Accepts ``"3"``, ``W/"3"`` and ``3``; ``*`` or no header means
+    unconditional. Raises ``ValueError`` for anything else.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    value = header.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    # ETags may carry a content hash after the version, e.g. "3-ab12"
+    value = value.split("-", 1)[0]
+    return int(value)
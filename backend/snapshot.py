@@ -0,0 +1,215 @@
+"""Write the read API as static JSON files for hosting on a CDN.
+
+Each file holds exactly the body the live endpoint returns:
+
+    api/projects.json              GET /api/projects
+    api/projects/featured.json     GET /api/projects/featured
+    api/projects/{id}.json         GET /api/projects/{id}
+    api/personal-info.json         GET /api/personal-info
+    api/skills.json                GET /api/skills
+    api/portfolio.json             GET /api/portfolio
+
+A manifest records the ``updated_at`` of every project and of personal info
+and the ETag of every listing, so later runs only rewrite what changed:
+
+    python -m backend.snapshot --output ./snapshot
+    python -m backend.snapshot --output ./snapshot --full
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from dotenv import load_dotenv
+
+from .database.database import close_mongo_connection, connect_to_mongo, get_database
+from .services.personal_info_service import PersonalInfoService
+from .services.portfolio_service import PortfolioService
+from .services.project_service import ProjectService
+from .services.skill_service import SkillService
+from .utils.fast_json import dump_json
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+class Snapshot:
+    """Incremental writer for one output directory."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        project_service: ProjectService,
+        personal_info_service: PersonalInfoService,
+        skill_service: SkillService,
+        portfolio_service: PortfolioService
+    ):
+        self.output_dir = output_dir
+        self.project_service = project_service
+        self.personal_info_service = personal_info_service
+        self.skill_service = skill_service
+        self.portfolio_service = portfolio_service
+
+    async def write(self, full: bool = False) -> Dict[str, int]:
+        """Bring the snapshot up to date; returns how many files were written and removed."""
+        manifest = {} if full else self._load_manifest()
+        files: Dict[str, bytes] = {}
+        stale: List[str] = []
+
+        listing, featured, skills, portfolio, personal_info = await asyncio.gather(
+            self.project_service.get_project_listing(),
+            self.project_service.get_project_listing(featured_only=True),
+            self.skill_service.get_skill_listing(),
+            self.portfolio_service.get_portfolio(),
+            self.personal_info_service.get_personal_info()
+        )
+
+        previous_projects: Dict[str, str] = manifest.get("projects", {})
+        projects: Dict[str, str] = {}
+        for project in listing.items:
+            stamp = project.updated_at.isoformat()
+            projects[project.id] = stamp
+            if previous_projects.get(project.id) != stamp:
+                files[f"api/projects/{project.id}.json"] = dump_json(project)
+        for project_id in previous_projects.keys() - projects.keys():
+            stale.append(f"api/projects/{project_id}.json")
+
+        previous_etags: Dict[str, str] = manifest.get("etags", {})
+        etags = {
+            "projects": listing.etag,
+            "featured": featured.etag,
+            "skills": skills.etag,
+            "portfolio": portfolio.etag,
+        }
+        bodies = {
+            "projects": ("api/projects.json", listing.body),
+            "featured": ("api/projects/featured.json", featured.body),
+            "skills": ("api/skills.json", skills.body),
+            "portfolio": ("api/portfolio.json", portfolio.body),
+        }
+        for name, (path, body) in bodies.items():
+            if previous_etags.get(name) != etags[name]:
+                files[path] = body()
+
+        personal_info_stamp: Optional[str] = None
+        if personal_info is not None:
+            personal_info_stamp = personal_info.updated_at.isoformat()
+            if manifest.get("personal_info") != personal_info_stamp:
+                files["api/personal-info.json"] = dump_json(personal_info)
+        elif manifest.get("personal_info"):
+            stale.append("api/personal-info.json")
+
+        written = len(files)
+        # The manifest goes last, so an interrupted run is redone next time
+        files[MANIFEST_NAME] = json.dumps({
+            "generated_at": datetime.utcnow().isoformat(),
+            "projects": projects,
+            "personal_info": personal_info_stamp,
+            "etags": etags,
+        }, indent=2).encode()
+        removed = await asyncio.get_running_loop().run_in_executor(None, self._apply, files, stale)
+        return {"written": written, "removed": removed}
+
+    def _apply(self, files: Dict[str, bytes], stale: List[str]) -> int:
+        for relative_path, body in files.items():
+            self._write(relative_path, body)
+        return sum(self._remove(relative_path) for relative_path in stale)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.output_dir / MANIFEST_NAME) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning("Unreadable snapshot manifest; writing a full snapshot")
+            return {}
+
+    def _write(self, relative_path: str, body: bytes) -> None:
+        # Write and rename, so a CDN sync never picks up a half-written file;
+        # every worker writes the snapshot, so each needs its own temp file
+        path = self.output_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+
+    def _remove(self, relative_path: str) -> int:
+        try:
+            (self.output_dir / relative_path).unlink()
+            return 1
+        except FileNotFoundError:
+            return 0
+
+class SnapshotScheduler:
+    """Rewrite the snapshot after this worker's own writes.
+
+    Every ``interval`` seconds the versions of the project, skill and
+    personal info caches are compared with the last run; a change triggers
+    an incremental write. Several writes in one interval cost one run.
+    """
+
+    def __init__(self, snapshot: Snapshot, stamp: Callable[[], Hashable], interval: float = 5.0):
+        self.snapshot = snapshot
+        self.stamp = stamp
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        last = None
+        while True:
+            current = self.stamp()
+            if current != last:
+                try:
+                    result = await self.snapshot.write()
+                    last = current
+                    if result["written"] or result["removed"]:
+                        logger.info("Snapshot updated: %(written)d written, %(removed)d removed", result)
+                except Exception as e:
+                    logger.warning("Snapshot update failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+async def main(args: argparse.Namespace) -> Dict[str, int]:
+    await connect_to_mongo()
+    try:
+        database = await get_database()
+        project_service = ProjectService(database)
+        personal_info_service = PersonalInfoService(database)
+        skill_service = SkillService(database)
+        snapshot = Snapshot(
+            Path(args.output),
+            project_service,
+            personal_info_service,
+            skill_service,
+            PortfolioService(personal_info_service, project_service, skill_service)
+        )
+        return await snapshot.write(full=args.full)
+    finally:
+        await close_mongo_connection()
+
+def cli() -> None:
+    load_dotenv(Path(__file__).parent / '.env')
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", required=True, help="directory to write the snapshot into")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rewrite every file")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args))))
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+from .http_cache import list_etag
+
+_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value: Any) -> bytes:
+    """Serialize plain Python data, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+def dump_json(items: Any) -> bytes:
+    """Serialize a model, a list of models or plain data straight to JSON bytes.
+
+    Models go through pydantic-core's ``dump_json`` with a cached ``TypeAdapter``
+    per model class, skipping the validate / ``jsonable_encoder`` / ``json.dumps``
+    round trip FastAPI performs for ``response_model`` routes.
+    """
+    if isinstance(items, BaseModel):
+        return items.model_dump_json().encode()
+    if isinstance(items, list) and items and isinstance(items[0], BaseModel):
+        model = type(items[0])
+        adapter = _adapters.get(model)
+        if adapter is None:
+            adapter = _adapters[model] = TypeAdapter(List[model])
+        return adapter.dump_json(items)
+    return dumps(items)
+
+class RawJSONResponse(Response):
+    """JSON response whose body has already been serialized to bytes."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
+
+class SerializedListing:
+    """A cached list of models whose ETag and JSON body are computed at most once.
+
+    Stored in the read-through cache so that repeated hits on a list endpoint
+    reuse the same validators and bytes until the next write invalidates it.
+    """
+
+    __slots__ = ("items", "_etag", "_body")
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self._etag: Optional[str] = None
+        self._body: Optional[bytes] = None
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = list_etag(self.items, "")
+        return self._etag
+
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = dump_json(self.items)
+        return self._body
+
+class SerializedDocument:
+    """A cached model with a precomputed ETag whose JSON body is built at most once."""
+
+    __slots__ = ("document", "etag", "last_modified", "_body")
+
+    def __init__(self, document: BaseModel, etag: str, last_modified: Optional[datetime] = None):
+        self.document = document
+        self.etag = etag
+        self.last_modified = last_modified
+        self._body: Optional[bytes] = None
+
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = dump_json(self.document)
+        return self._body
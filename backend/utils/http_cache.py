@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+import hashlib
+
+# Clients and CDNs may store responses but must revalidate before reuse
+CACHE_CONTROL = "no-cache"
+
+# For content-addressed files, whose URL changes whenever their bytes do
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def _digest(*parts: Any) -> str:
+    raw = "|".join(str(part) for part in parts).encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+def _fingerprint(item: Any) -> str:
+    if isinstance(item, dict):
+        return repr(sorted(item.items()))
+    return "|".join(
+        str(getattr(item, field, ""))
+        # duplicate_count changes when the spam filter collapses a resubmission
+        for field in ("id", "version", "updated_at", "read", "duplicate_count")
+    )
+
+def document_etag(document: Any) -> str:
+    """Weak ETag for a single document.
+
+    Versioned documents put the version first so the ETag can be sent back
+    unchanged as ``If-Match`` on a PUT.
+    """
+    digest = _digest(_fingerprint(document))
+    version = getattr(document, "version", None)
+    if version is not None:
+        return f'W/"{version}-{digest}"'
+    return f'W/"{digest}"'
+
+def list_etag(items: Iterable[Any], *extra: Any) -> str:
+    """Weak ETag for a listing, derived from the identity and version of each item.
+
+    Built from document metadata rather than the serialized body, so it can be
+    checked before any response serialization happens.
+    """
+    h = hashlib.sha1()
+    for part in extra:
+        h.update(str(part).encode())
+    for item in items:
+        h.update(_fingerprint(item).encode())
+        h.update(b"\n")
+    return f'W/"{h.hexdigest()[:16]}"'
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Attach validators to ``response`` and evaluate the request's preconditions.
+
+    Returns a ``304 Not Modified`` response when the client's copy is still
+    current, or ``None`` when the full body should be sent.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and request.headers.get("if-modified-since"):
+        not_modified = _not_modified_since(request.headers["if-modified-since"], last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return None
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files named after their content, so clients may cache them forever."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
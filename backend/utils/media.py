@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+from ..services.media_store import MediaFile
+from .http_cache import CACHE_CONTROL
+
+CHUNK_SIZE = 256 * 1024
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into an inclusive ``(start, end)``.
+
+    Returns ``None`` when the header should be ignored (other units, several
+    ranges or a malformed value), in which case the whole file is sent.
+    Raises ``RangeNotSatisfiable`` when the range lies outside the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end and first and last:
+        return None
+    if start >= size or size == 0:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+class RangeFileResponse(Response):
+    """Stream a ``MediaFile`` with validators, conditional GET and single-range support.
+
+    Uses the ASGI ``http.response.zerocopysend`` extension (``sendfile``)
+    when the server offers it, and otherwise reads chunks with ``pread`` in
+    the thread pool. The file is released when the response finishes.
+    """
+
+    def __init__(self, media_file: MediaFile, request_headers: Headers, method: str = "GET"):
+        self.media_file = media_file
+        self.request_headers = request_headers
+        self.send_body = method != "HEAD"
+        self.background = None
+        self.last_modified = datetime.fromtimestamp(media_file.mtime, tz=timezone.utc)
+        self.status_code, self.range = self._evaluate()
+        self.init_headers(self._headers())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if not self.send_body or self.range is None:
+                await send({"type": "http.response.body", "body": b""})
+                return
+            start, end = self.range
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": self.media_file.fd,
+                    "offset": start,
+                    "count": end - start + 1,
+                    "more_body": False,
+                })
+                return
+            offset = start
+            while offset <= end:
+                length = min(CHUNK_SIZE, end - offset + 1)
+                chunk = await run_in_threadpool(self.media_file.read, offset, length)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": offset <= end})
+            if offset <= end:
+                # The file shrank while being sent
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            self.media_file.release()
+
+    def _evaluate(self) -> Tuple[int, Optional[Tuple[int, int]]]:
+        size = self.media_file.size
+        if self._not_modified():
+            return 304, None
+
+        header = self.request_headers.get("range")
+        if header and self._if_range_matches():
+            try:
+                byte_range = parse_range(header, size)
+            except RangeNotSatisfiable:
+                return 416, None
+            if byte_range is not None:
+                return 206, byte_range
+        return 200, (0, size - 1) if size else None
+
+    def _not_modified(self) -> bool:
+        if_none_match = self.request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or self.media_file.etag in tags
+        since = self.request_headers.get("if-modified-since")
+        if since:
+            try:
+                return self.last_modified.replace(microsecond=0) <= parsedate_to_datetime(since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _if_range_matches(self) -> bool:
+        if_range = self.request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith('"'):
+            return if_range == self.media_file.etag
+        try:
+            return parsedate_to_datetime(if_range) >= self.last_modified.replace(microsecond=0)
+        except (TypeError, ValueError):
+            return False
+
+    def _headers(self) -> dict:
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": self.media_file.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": CACHE_CONTROL,
+        }
+        size = self.media_file.size
+        if self.status_code == 416:
+            headers["Content-Range"] = f"bytes */{size}"
+            headers["Content-Length"] = "0"
+        elif self.status_code == 304:
+            return headers
+        else:
+            headers["Content-Type"] = self.media_file.media_type
+            start, end = self.range if self.range else (0, -1)
+            headers["Content-Length"] = str(end - start + 1)
+            if self.status_code == 206:
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return headers
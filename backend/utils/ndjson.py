@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Any, AsyncIterator
+import json
+
+MEDIA_TYPE = "application/x-ndjson"
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_line(document: dict) -> bytes:
+    return (json.dumps(document, default=_default, separators=(",", ":")) + "\n").encode()
+
+async def stream_cursor(cursor, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Yield NDJSON for every document of a Motor cursor.
+
+    Lines are grouped into chunks of roughly ``chunk_size`` bytes so large
+    exports do not produce one network write per document, while memory use
+    stays bounded by a single chunk plus the driver's current batch.
+    """
+    buffer = bytearray()
+    async for document in cursor:
+        buffer += dumps_line(document)
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
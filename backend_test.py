@@ -36,23 +36,46 @@ class PortfolioAPITest:
             self.test_create_project,
             self.test_get_all_projects,
             self.test_get_project_by_id,
+            self.test_conditional_get_project,
             self.test_update_project,
+            self.test_update_project_version_conflict,
+            self.test_project_list_reflects_update,
+            self.test_search_projects,
+            self.test_technology_facets,
             self.test_get_featured_projects,
+            self.test_paginate_projects,
+            self.test_bulk_import_and_export_projects,
+            self.test_cache_stats,
+            self.test_compressed_project_list,
             
             # Personal info tests
             self.test_create_personal_info,
             self.test_get_personal_info,
             self.test_update_personal_info,
             
+            # Skill and portfolio tests
+            self.test_skill_category_crud,
+            self.test_get_portfolio,
+            
             # Contact tests
             self.test_create_contact,
             self.test_get_all_contacts,
             self.test_get_contact_by_id,
             self.test_mark_contact_as_read,
+            self.test_contact_stats,
+            self.test_bulk_contacts,
+            self.test_duplicate_contact_collapsed,
             
             # Error handling tests
             self.test_invalid_project_id,
             self.test_invalid_contact_id,
+            self.test_contact_rate_limit,
+            
+            # Media tests
+            self.test_media_range_request,
+            
+            # Observability tests
+            self.test_metrics_endpoint,
             
             # Cleanup tests (should be last)
             self.test_delete_project,
@@ -170,6 +193,24 @@ class PortfolioAPITest:
         print(f"Failed to get project: {response.status_code}, {response.text}")
         return False
     
+    def test_conditional_get_project(self):
+        """Test that a matching If-None-Match returns 304 Not Modified"""
+        if not self.project_id:
+            print("No project ID available for testing")
+            return False
+        
+        response = requests.get(f"{self.api_url}/projects/{self.project_id}")
+        etag = response.headers.get("ETag")
+        if response.status_code != 200 or not etag or not response.headers.get("Last-Modified"):
+            print(f"Missing validators: {response.status_code}, {response.headers}")
+            return False
+        
+        response = requests.get(
+            f"{self.api_url}/projects/{self.project_id}",
+            headers={"If-None-Match": etag}
+        )
+        return response.status_code == 304 and not response.content
+    
     def test_update_project(self):
         """Test updating a project"""
         if not self.project_id:
@@ -198,6 +239,175 @@ class PortfolioAPITest:
         print(f"Failed to update project: {response.status_code}, {response.text}")
         return False
     
+    def test_update_project_version_conflict(self):
+        """Test that a stale If-Match version is rejected with 412"""
+        if not self.project_id:
+            print("No project ID available for testing")
+            return False
+        
+        current = requests.get(f"{self.api_url}/projects/{self.project_id}").json()
+        version = current.get("version")
+        
+        response = requests.put(
+            f"{self.api_url}/projects/{self.project_id}",
+            json={"short_description": "Conditional update"},
+            headers={"If-Match": f'"{version}"'}
+        )
+        if response.status_code != 200 or response.json().get("version") != version + 1:
+            print(f"Conditional update failed: {response.status_code}, {response.text}")
+            return False
+        
+        # Re-using the old version must now fail
+        response = requests.put(
+            f"{self.api_url}/projects/{self.project_id}",
+            json={"short_description": "Stale update"},
+            headers={"If-Match": f'"{version}"'}
+        )
+        return response.status_code == 412
+    
+    def test_project_list_reflects_update(self):
+        """Test that the cached project list is invalidated by updates"""
+        if not self.project_id:
+            print("No project ID available for testing")
+            return False
+        
+        # Warm the cache, then update and read the list again
+        requests.get(f"{self.api_url}/projects")
+        new_title = f"Cache Check {uuid.uuid4()}"
+        requests.put(f"{self.api_url}/projects/{self.project_id}", json={"title": new_title})
+        
+        response = requests.get(f"{self.api_url}/projects")
+        
+        if response.status_code == 200:
+            data = response.json()
+            return any(p.get("id") == self.project_id and p.get("title") == new_title for p in data)
+        
+        print(f"Failed to get projects: {response.status_code}, {response.text}")
+        return False
+    
+    def test_search_projects(self):
+        """Test that search finds the test project by a prefix of its title"""
+        if not self.project_id:
+            print("No project ID available for testing")
+            return False
+        
+        title = requests.get(f"{self.api_url}/projects/{self.project_id}").json()["title"]
+        # Type part of the last word, as a search box would
+        query = title.split("-")[-1][:6]
+        response = requests.get(f"{self.api_url}/projects/search", params={"q": query})
+        
+        if response.status_code == 200:
+            results = response.json()
+            return bool(results) and results[0]["id"] == self.project_id
+        
+        print(f"Failed to search projects: {response.status_code}, {response.text}")
+        return False
+    
+    def test_technology_facets(self):
+        """Test facet counts and filtering projects by normalized technology tags"""
+        response = requests.get(f"{self.api_url}/projects/facets")
+        if response.status_code != 200:
+            print(f"Failed to get facets: {response.status_code}, {response.text}")
+            return False
+        
+        facets = {facet["tag"]: facet for facet in response.json()}
+        if any(facet["count"] != len(facet["project_ids"]) for facet in facets.values()):
+            print("Facet counts do not match their project ids")
+            return False
+        if "python" not in facets:
+            print("Expected a python facet")
+            return False
+        
+        response = requests.get(f"{self.api_url}/projects", params={"tech": "PYTHON"})
+        return sorted(p["id"] for p in response.json()) == sorted(facets["python"]["project_ids"])
+    
+    def test_paginate_projects(self):
+        """Test keyset pagination and field projection on the project list"""
+        seen = []
+        after = None
+        
+        while True:
+            params = {"limit": 1, "fields": "title"}
+            if after:
+                params["after"] = after
+            response = requests.get(f"{self.api_url}/projects", params=params)
+            
+            if response.status_code != 200:
+                print(f"Failed to page projects: {response.status_code}, {response.text}")
+                return False
+            
+            data = response.json()
+            if any("description" in p for p in data):
+                print("Projection returned unrequested fields")
+                return False
+            
+            seen.extend(p["id"] for p in data)
+            after = response.headers.get("X-Next-Cursor")
+            if not after:
+                break
+        
+        # Every project must appear exactly once across the pages
+        all_ids = [p["id"] for p in requests.get(f"{self.api_url}/projects").json()]
+        return seen == all_ids
+    
+    def test_bulk_import_and_export_projects(self):
+        """Test unordered bulk import with per-item errors and NDJSON export"""
+        project_data = {
+            "title": f"Bulk Project {uuid.uuid4()}",
+            "short_description": "Imported in bulk",
+            "description": "Created by the bulk import test.",
+            "technologies": ["Python"],
+            "images": []
+        }
+        
+        response = requests.post(
+            f"{self.api_url}/projects/bulk",
+            params={"ordered": "false"},
+            json=[project_data, {"title": "Missing fields"}, project_data]
+        )
+        if response.status_code != 200:
+            print(f"Bulk import failed: {response.status_code}, {response.text}")
+            return False
+        
+        result = response.json()
+        inserted_ids = result.get("inserted_ids", [])
+        errors = result.get("errors", [])
+        ok = result.get("inserted_count") == 2 and [e["index"] for e in errors] == [1]
+        
+        response = requests.get(f"{self.api_url}/projects/export", stream=True)
+        exported = {json.loads(line)["id"] for line in response.iter_lines() if line}
+        ok = ok and set(inserted_ids) <= exported
+        
+        for project_id in inserted_ids:
+            requests.delete(f"{self.api_url}/projects/{project_id}")
+        
+        return ok
+    
+    def test_cache_stats(self):
+        """Test the cache statistics endpoint"""
+        response = requests.get(f"{self.api_url}/cache/stats")
+        
+        if response.status_code == 200:
+            data = response.json()
+            stats = data.get("projects", {})
+            return "hits" in stats and "misses" in stats
+        
+        print(f"Failed to get cache stats: {response.status_code}, {response.text}")
+        return False
+    
+    def test_compressed_project_list(self):
+        """Test that large listings are gzip encoded when the client accepts it"""
+        response = requests.get(f"{self.api_url}/projects", headers={"Accept-Encoding": "gzip"})
+        
+        if response.status_code == 200:
+            # Small bodies are sent uncompressed
+            if len(response.content) < 1024:
+                return True
+            return response.headers.get("Content-Encoding") == "gzip" and "Accept-Encoding" in response.headers.get("Vary", "")
+        
+        print(f"Failed to get projects: {response.status_code}, {response.text}")
+        return False
+    
     def test_get_featured_projects(self):
         """Test getting featured projects"""
         response = requests.get(f"{self.api_url}/projects/featured")
@@ -301,12 +511,60 @@ class PortfolioAPITest:
         print(f"Failed to update personal info: {response.status_code}, {response.text}")
         return False
     
+    # Skill and Portfolio API Tests
+    def test_skill_category_crud(self):
+        """Test creating, updating and deleting a skill category"""
+        skill_data = {
+            "category": "Test Category",
+            "skills": [{"name": "Python", "level": 90}]
+        }
+        
+        response = requests.post(f"{self.api_url}/skills", json=skill_data)
+        if response.status_code != 200:
+            print(f"Failed to create skill category: {response.status_code}, {response.text}")
+            return False
+        category_id = response.json()["id"]
+        
+        response = requests.put(f"{self.api_url}/skills/{category_id}", json={"category": "Updated Category"})
+        if response.status_code != 200 or response.json().get("category") != "Updated Category":
+            print(f"Failed to update skill category: {response.status_code}, {response.text}")
+            return False
+        
+        response = requests.get(f"{self.api_url}/skills")
+        if not any(c["id"] == category_id for c in response.json()):
+            print("Created skill category missing from listing")
+            return False
+        
+        response = requests.delete(f"{self.api_url}/skills/{category_id}")
+        if response.status_code != 200:
+            print(f"Failed to delete skill category: {response.status_code}, {response.text}")
+            return False
+        
+        return requests.get(f"{self.api_url}/skills/{category_id}").status_code == 404
+    
+    def test_get_portfolio(self):
+        """Test the aggregated portfolio endpoint and its conditional GET"""
+        response = requests.get(f"{self.api_url}/portfolio")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if not all(key in data for key in ("personal_info", "featured_projects", "skills")):
+                print(f"Missing portfolio sections: {data.keys()}")
+                return False
+            
+            cached = requests.get(f"{self.api_url}/portfolio", headers={"If-None-Match": response.headers["ETag"]})
+            return cached.status_code == 304
+        
+        print(f"Failed to get portfolio: {response.status_code}, {response.text}")
+        return False
+    
     # Contact API Tests
     def test_create_contact(self):
         """Test creating a contact submission"""
         contact_data = {
             "name": "Test Contact",
-            "email": "contact@example.com",
+            # Unique per run; resending one message from one address is collapsed
+            "email": f"contact-{uuid.uuid4().hex[:8]}@example.com",
             "subject": "Test Contact Submission",
             "message": "This is a test contact submission created by automated tests."
         }
@@ -377,6 +635,71 @@ class PortfolioAPITest:
         print(f"Failed to mark contact as read: {response.status_code}, {response.text}")
         return False
     
+    def test_contact_stats(self):
+        """Test the maintained contact counters"""
+        response = requests.get(f"{self.api_url}/contacts/stats", params={"days": 7})
+        
+        if response.status_code == 200:
+            data = response.json()
+            return (
+                data["total"] >= data["unread"] >= 0
+                and len(data["per_day"]) == 7
+                and data["per_day"][-1]["count"] >= 1
+            )
+        
+        print(f"Failed to get contact stats: {response.status_code}, {response.text}")
+        return False
+    
+    def test_bulk_contacts(self):
+        """Test marking and deleting contacts selected by a filter in one request"""
+        email = f"bulk-{uuid.uuid4().hex[:8]}@example.com"
+        messages = [
+            "Created to test bulk contact operations.",
+            "A second submission, so the bulk request selects two contacts."
+        ]
+        for i, message in enumerate(messages):
+            requests.post(f"{self.api_url}/contacts", json={
+                "name": "Bulk Test",
+                "email": email,
+                "subject": f"Bulk {i}",
+                "message": message
+            })
+        
+        response = requests.post(f"{self.api_url}/contacts/bulk", json={"action": "mark_read", "filter": {"email": email}})
+        if response.status_code != 200 or response.json().get("affected_count") != 2:
+            print(f"Failed to bulk mark contacts: {response.status_code}, {response.text}")
+            return False
+        
+        response = requests.post(f"{self.api_url}/contacts/bulk", json={"action": "delete", "filter": {"email": email, "read": True}})
+        if response.status_code == 200:
+            return response.json().get("affected_count") == 2
+        
+        print(f"Failed to bulk delete contacts: {response.status_code}, {response.text}")
+        return False
+    
+    def test_duplicate_contact_collapsed(self):
+        """Test that resending a message from the same address is collapsed into the original"""
+        contact_data = {
+            "name": "Duplicate Test",
+            "email": f"duplicate-{uuid.uuid4().hex[:8]}@example.com",
+            "subject": "Duplicate",
+            "message": "Hello, I would like to talk about a project with you next month."
+        }
+        
+        first = requests.post(f"{self.api_url}/contacts", json=contact_data)
+        second = requests.post(f"{self.api_url}/contacts", json=contact_data)
+        if first.status_code != 200 or second.status_code != 200:
+            print(f"Failed to create contacts: {first.status_code}, {second.status_code}")
+            return False
+        
+        original = requests.get(f"{self.api_url}/contacts/{first.json()['id']}")
+        duplicate = requests.get(f"{self.api_url}/contacts/{second.json()['id']}")
+        return (
+            original.status_code == 200
+            and original.json().get("duplicate_count") == 1
+            and duplicate.status_code == 404
+        )
+    
     def test_delete_contact(self):
         """Test deleting a contact"""
         if not self.contact_id:
@@ -407,6 +730,55 @@ class PortfolioAPITest:
         response = requests.get(f"{self.api_url}/contacts/{invalid_id}")
         
         return response.status_code == 404
+    
+    def test_contact_rate_limit(self):
+        """Test that repeated contact submissions are rejected with 429 and Retry-After"""
+        contact_data = {
+            "name": "Rate Limit Test",
+            "email": f"ratelimit-{uuid.uuid4().hex[:8]}@example.com",
+            "subject": "Rate limit",
+            "message": "Checking the contact form rate limit."
+        }
+        
+        for _ in range(20):
+            response = requests.post(f"{self.api_url}/contacts", json=contact_data)
+            if response.status_code == 429:
+                return int(response.headers.get("Retry-After", "0")) > 0
+            if response.status_code != 200:
+                print(f"Unexpected status: {response.status_code}, {response.text}")
+                return False
+        
+        print("No submission was rate limited")
+        return False
+
+    
+    # Media Tests
+    def test_media_range_request(self):
+        """Test partial content responses from the media endpoint"""
+        response = requests.get(f"{self.api_url}/media/UIUXResume.pdf", headers={"Range": "bytes=0-99"})
+        
+        if response.status_code == 206:
+            return (
+                len(response.content) == 100
+                and response.headers.get("Content-Range", "").startswith("bytes 0-99/")
+                and response.content.startswith(b"%PDF")
+            )
+        
+        print(f"Failed to get media range: {response.status_code}, {response.text[:200]}")
+        return False
+
+    
+    # Observability Tests
+    def test_metrics_endpoint(self):
+        """Test that /metrics exposes per-route latency in Prometheus format"""
+        requests.get(f"{self.api_url}/projects")
+        response = requests.get(f"{BACKEND_URL}/metrics")
+        
+        if response.status_code == 200:
+            return 'http_request_duration_seconds_count{method="GET",route="/api/projects"' in response.text
+        
+        print(f"Failed to get metrics: {response.status_code}, {response.text}")
+        return False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""Compare FastAPI's default response path with the fast JSON path on large project lists.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_serialization --projects 1000 --rounds 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from backend.models.project import Project
+from backend.utils.fast_json import RawJSONResponse, SerializedListing, dump_json
+
+def make_projects(count: int) -> List[Project]:
+    return [
+        Project(
+            title=f"Project {i}",
+            short_description="A short description used on project cards.",
+            description="A long form project write-up. " * 40,
+            technologies=["React", "FastAPI", "MongoDB", "Tailwind CSS"],
+            images=[f"/project-{i}-{n}.png" for n in range(4)],
+            live_link=f"https://example.com/{i}",
+            github_link=f"https://github.com/example/{i}",
+            featured=i % 5 == 0
+        )
+        for i in range(count)
+    ]
+
+def measure(fn: Callable[[], bytes], rounds: int) -> dict:
+    fn()  # warm up
+    timings = []
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        size = len(fn())
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "bytes": size,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    projects = make_projects(args.projects)
+    field = create_response_field(name="Response_get_all_projects", type_=List[Project])
+    loop = asyncio.new_event_loop()
+
+    def default_path() -> bytes:
+        # What a response_model route does: revalidate, encode, json.dumps
+        content = loop.run_until_complete(serialize_response(field=field, response_content=projects))
+        return JSONResponse(content).body
+
+    def fast_path() -> bytes:
+        return RawJSONResponse(dump_json(projects)).body
+
+    listing = SerializedListing(projects)
+
+    def cached_path() -> bytes:
+        # Cache hit: body was serialized once when the listing was loaded
+        return RawJSONResponse(listing.body()).body
+
+    assert json.loads(default_path()) == json.loads(fast_path())
+
+    results = {
+        "projects": args.projects,
+        "rounds": args.rounds,
+        "default": measure(default_path, args.rounds),
+        "fast_json": measure(fast_path, args.rounds),
+        "fast_json_cached": measure(cached_path, args.rounds),
+    }
+    results["speedup"] = round(results["default"]["mean_ms"] / results["fast_json"]["mean_ms"], 2)
+    print(json.dumps(results, indent=2))
+    loop.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Concurrent load test for the Portfolio API, run fully in-process.
+
+The FastAPI app is driven through httpx's ASGI transport, so no server or
+network is involved. MongoDB is replaced by mongomock-motor unless
+``--mongo-url`` points at a (throwaway) mongod. Results are printed as JSON
+and can be written to a file and compared with an earlier run:
+
+    python -m benchmarks.load_test --output before.json
+    python -m benchmarks.load_test --compare before.json
+
+Rate limits are disabled unless ``--rate-limits`` is given, since every
+request comes from the same client and would otherwise measure 429s.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from .bench_serialization import make_projects
+
+SCENARIOS = ["list", "featured", "get_by_id", "personal_info", "contact_submit"]
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def use_mongomock() -> None:
+    """Point the app's database layer at an in-memory mongomock-motor client."""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+        import mongomock.database
+    except ImportError:
+        sys.exit("mongomock-motor is required without --mongo-url: pip install mongomock-motor")
+
+    from backend.database import database
+
+    client = AsyncMongoMockClient()
+    database.AsyncIOMotorClient = lambda *args, **kwargs: client
+
+    # mongomock rejects the check_exists option and existing collections
+    create_collection = mongomock.database.Database.create_collection
+
+    def lenient_create_collection(self, name, **kwargs):
+        kwargs.pop("check_exists", None)
+        if name in self.list_collection_names():
+            return self[name]
+        return create_collection(self, name, **kwargs)
+
+    mongomock.database.Database.create_collection = lenient_create_collection
+
+async def seed(client: httpx.AsyncClient, project_count: int) -> List[str]:
+    projects = [p.dict(exclude={"id", "created_at", "updated_at", "version"}) for p in make_projects(project_count)]
+    response = await client.post("/api/projects/bulk", json=projects)
+    response.raise_for_status()
+    await client.post("/api/personal-info", json={
+        "name": "Load Test",
+        "title": "Developer",
+        "email": "load@example.com",
+        "bio": "Seeded by the load test."
+    })
+    return response.json()["inserted_ids"]
+
+def build_scenarios(project_ids: List[str]) -> Dict[str, Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]]:
+    def contact(i: int) -> dict:
+        return {
+            "name": "Load Test",
+            # Unique per request: a resend from one address is collapsed by the spam filter
+            "email": f"load-{i}-{uuid.uuid4().hex[:8]}@example.com",
+            "subject": f"Load test {uuid.uuid4()}",
+            "message": "Message body sent by the load test."
+        }
+
+    return {
+        "list": lambda c, i: c.get("/api/projects"),
+        "featured": lambda c, i: c.get("/api/projects/featured"),
+        "get_by_id": lambda c, i: c.get(f"/api/projects/{project_ids[i % len(project_ids)]}"),
+        "personal_info": lambda c, i: c.get("/api/personal-info"),
+        "contact_submit": lambda c, i: c.post("/api/contacts", json=contact(i)),
+    }
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int
+) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await request(client, i)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: dict, baseline: dict) -> dict:
+    """Percentage change of each scenario's metrics relative to ``baseline``."""
+    deltas = {}
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        deltas[name] = {
+            metric: round((result[metric] - before[metric]) / before[metric] * 100, 1)
+            for metric in ("rps", "p50_ms", "p95_ms", "p99_ms")
+            if before.get(metric)
+        }
+    return deltas
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.mongo_url:
+        os.environ["MONGO_URL"] = args.mongo_url
+        os.environ["DB_NAME"] = f"portfolio_load_{uuid.uuid4().hex[:8]}"
+    else:
+        os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+        use_mongomock()
+    # Read by the container at startup, so it must be set before the app is imported
+    os.environ["RATE_LIMITS"] = args.rate_limits
+
+    from backend.database.database import db
+    from backend.server import app
+
+    # One INFO line per request would dominate the measurement
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    scenarios = args.scenarios or SCENARIOS
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            project_ids = await seed(client, args.projects)
+            requests = build_scenarios(project_ids)
+            for name in scenarios:
+                # Warm caches and code paths before measuring
+                await run_scenario(client, requests[name], min(args.requests, 50), args.concurrency)
+                results[name] = await run_scenario(client, requests[name], args.requests, args.concurrency)
+        if args.mongo_url:
+            await db.client.drop_database(os.environ["DB_NAME"])
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "backend": "mongod" if args.mongo_url else "mongomock",
+        "config": {
+            "projects": args.projects,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "rate_limits": args.rate_limits,
+        },
+        "scenarios": results,
+    }
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200, help="projects to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--scenario", dest="scenarios", action="append", choices=SCENARIOS,
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--rate-limits", default="{}",
+                        help="RATE_LIMITS JSON for the app; rate limiting is off by default")
+    parser.add_argument("--mongo-url", help="use a real mongod; a temporary database is created and dropped")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    if args.compare:
+        with open(args.compare) as f:
+            report["change_pct"] = compare(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    cli()
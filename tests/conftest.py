@@ -0,0 +1,13 @@
+import os
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# backend.database reads these at import time; nothing connects to them
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "portfolio_test")
+
+@pytest.fixture
+def database():
+    """A fresh in-memory database per test."""
+    return AsyncMongoMockClient()["portfolio_test"]
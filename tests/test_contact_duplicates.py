@@ -0,0 +1,63 @@
+import asyncio
+
+from backend.models.contact import ContactCreate
+from backend.services.contact_ingest import ContactIngestQueue
+from backend.services.contact_service import ContactService
+from backend.services.spam_filter import SpamFilter
+from backend.utils.http_cache import document_etag, list_etag
+
+SUBMISSION = ContactCreate(
+    name="Test",
+    email="duplicate@example.com",
+    subject="Project",
+    message="Hello, I would like to talk about a project with you next month."
+)
+
+def test_collapsed_duplicate_changes_etags(database):
+    service = ContactService(database, spam_filter=SpamFilter())
+
+    async def scenario():
+        original = await service.create_contact(SUBMISSION)
+        listing, _ = await service.list_contacts()
+        before = (list_etag(listing, ""), document_etag(await service.get_contact(original.id)))
+
+        duplicate = await service.create_contact(SUBMISSION)
+        listing, _ = await service.list_contacts()
+        stored = await service.get_contact(original.id)
+        after = (list_etag(listing, ""), document_etag(stored))
+        return before, after, stored, await service.get_contact(duplicate.id), len(listing)
+
+    before, after, stored, duplicate, count = asyncio.run(scenario())
+    assert stored.duplicate_count == 1
+    assert duplicate is None and count == 1
+    assert before[0] != after[0]
+    assert before[1] != after[1]
+
+def test_duplicate_of_pending_contact_is_counted(database, tmp_path):
+    async def scenario():
+        # Nothing is flushed until stop(), so the original stays pending
+        ingest = ContactIngestQueue(database.contacts, tmp_path / "contacts.ndjson", flush_interval=60)
+        service = ContactService(database, ingest=ingest, spam_filter=SpamFilter())
+        await ingest.start()
+        original = await service.create_contact(SUBMISSION)
+        await service.create_contact(SUBMISSION)
+        pending = ingest.pending(original.id)
+        await ingest.stop()
+        stored = await database.contacts.find_one({"id": original.id})
+        return pending, stored, await database.contacts.count_documents({})
+
+    pending, stored, count = asyncio.run(scenario())
+    assert pending.duplicate_count == 1
+    assert stored["duplicate_count"] == 1
+    assert count == 1
+
+def test_duplicate_of_deleted_contact_is_stored(database):
+    service = ContactService(database, spam_filter=SpamFilter())
+
+    async def scenario():
+        original = await service.create_contact(SUBMISSION)
+        await service.delete_contact(original.id)
+        resent = await service.create_contact(SUBMISSION)
+        return await service.get_contact(resent.id)
+
+    assert asyncio.run(scenario()) is not None
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.models.contact import Contact
+from backend.services.contact_ingest import ContactIngestQueue, IngestQueueFullError
+from backend.utils.ndjson import dumps_line
+
+def make_contact(i: int) -> Contact:
+    return Contact(name="Test", email=f"ingest-{i}@example.com", subject=f"Subject {i}", message=f"Message {i}")
+
+class BlockingCollection:
+    """Wraps a collection so insert_many waits until ``release`` is set."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.release = asyncio.Event()
+
+    async def insert_many(self, documents, **kwargs):
+        await self.release.wait()
+        return await self.collection.insert_many(documents, **kwargs)
+
+def test_spool_replayed_exactly_once(database, tmp_path):
+    spool = tmp_path / "contacts.ndjson"
+    contacts = [make_contact(i).dict() for i in range(3)]
+    # Left by a crash: one contact stored before the crash, a line written
+    # twice, and a torn final line
+    lines = [dumps_line(c) for c in contacts] + [dumps_line(contacts[1]), b'{"id": "torn']
+    spool.write_bytes(b"".join(lines))
+
+    async def scenario():
+        # Replays rely on the unique id index declared by ContactService
+        await database.contacts.create_index("id", name="id_unique", unique=True)
+        await database.contacts.insert_one(dict(contacts[0]))
+        queue = ContactIngestQueue(database.contacts, spool)
+        await queue.start()
+        await queue.stop()
+        return [d["id"] async for d in database.contacts.find({}, {"id": 1})]
+
+    stored = asyncio.run(scenario())
+    assert sorted(stored) == sorted(c["id"] for c in contacts)
+    assert spool.read_bytes() == b""
+
+def test_stop_drains_a_partial_batch(database, tmp_path):
+    async def scenario():
+        # The flusher is waiting for a batch that would take a minute to fill
+        queue = ContactIngestQueue(database.contacts, tmp_path / "contacts.ndjson", batch_size=100, flush_interval=60)
+        await queue.start()
+        for i in range(5):
+            await queue.submit(make_contact(i))
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(queue.stop(timeout=5), 2)
+        return await database.contacts.count_documents({})
+
+    assert asyncio.run(scenario()) == 5
+    assert (tmp_path / "contacts.ndjson").read_bytes() == b""
+
+def test_full_queue_rejects_submissions(database, tmp_path):
+    collection = BlockingCollection(database.contacts)
+
+    async def scenario():
+        queue = ContactIngestQueue(
+            collection,
+            tmp_path / "contacts.ndjson",
+            batch_size=1,
+            flush_interval=0,
+            max_queue=1,
+            enqueue_timeout=0.05
+        )
+        await queue.start()
+        await queue.submit(make_contact(0))
+        await asyncio.sleep(0.01)  # taken by the flusher, which blocks
+        await queue.submit(make_contact(1))  # fills the queue
+        try:
+            await queue.submit(make_contact(2))
+            rejected = False
+        except IngestQueueFullError:
+            rejected = True
+        # Accepted contacts survive in the spool until stored
+        spooled = [json.loads(line)["subject"] for line in (tmp_path / "contacts.ndjson").read_bytes().splitlines()]
+        collection.release.set()
+        await queue.stop()
+        return rejected, spooled, await database.contacts.count_documents({})
+
+    rejected, spooled, stored = asyncio.run(scenario())
+    assert rejected
+    assert spooled == ["Subject 0", "Subject 1"]
+    assert stored == 2
+
+def test_full_queue_returns_503():
+    from backend.server import app, get_contact_service
+
+    class FullService:
+        async def create_contact(self, contact):
+            raise IngestQueueFullError("Contact ingestion queue is full")
+
+    app.dependency_overrides[get_contact_service] = lambda: FullService()
+    try:
+        response = TestClient(app).post("/api/contacts", json={
+            "name": "Test",
+            "email": "busy@example.com",
+            "subject": "Busy",
+            "message": "The queue is full."
+        })
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_contacts_stored_as_submitted_leave_pending(database, tmp_path):
+    async def scenario():
+        # Every submission is flushed at once, possibly before submit() returns
+        queue = ContactIngestQueue(database.contacts, tmp_path / "contacts.ndjson", batch_size=1, flush_interval=0)
+        await queue.start()
+        for i in range(5):
+            await queue.submit(make_contact(i))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.05)
+        still_pending = len(queue._pending)
+        await asyncio.wait_for(queue.stop(timeout=5), 1)
+        return still_pending, await database.contacts.count_documents({})
+
+    still_pending, stored = asyncio.run(scenario())
+    assert still_pending == 0
+    assert stored == 5
+    assert (tmp_path / "contacts.ndjson").read_bytes() == b""
@@ -0,0 +1,95 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import zstandard
+
+from backend.models.contact import Contact
+from backend.services.contact_retention import ContactRetention
+from backend.services.contact_service import ContactService
+from backend.services.contact_stats import ContactCounters
+
+NOW = datetime(2026, 6, 1)
+
+async def seed(database, counters):
+    contacts = [
+        Contact(name="Old read", email="old@example.com", subject="Old", message="Old", created_at=NOW - timedelta(days=400), read=True),
+        Contact(name="Recent read", email="recent@example.com", subject="Recent", message="Recent", created_at=NOW - timedelta(days=100), read=True),
+        Contact(name="Old unread", email="unread@example.com", subject="Unread", message="Unread", created_at=NOW - timedelta(days=400)),
+        Contact(name="New", email="new@example.com", subject="New", message="New", created_at=NOW - timedelta(days=1), read=True),
+    ]
+    documents = [contact.dict() for contact in contacts]
+    await database.contacts.insert_many([dict(d) for d in documents])
+    await counters.record_created(documents)
+    return contacts
+
+def test_archive_then_cold_export_then_lookup(database, tmp_path):
+    counters = ContactCounters(database)
+    service = ContactService(database, counters=counters)
+    retention = ContactRetention(
+        database,
+        cold_dir=tmp_path,
+        archive_after=timedelta(days=90),
+        cold_after=timedelta(days=365),
+        batch_size=1,
+        counters=counters
+    )
+
+    async def scenario():
+        old, recent, unread, new = await seed(database, counters)
+
+        first = await retention.run(NOW)
+        live = sorted([d["id"] async for d in database.contacts.find({}, {"id": 1})])
+        archived = await database.contacts_archive.find_one({"id": recent.id})
+        stats = await service.get_stats()
+        # Archived contacts stay readable by id until they expire
+        looked_up = [await service.get_contact(c.id) for c in (old, recent)]
+
+        second = await retention.run(NOW)
+        exported = await database.contacts_archive.find_one({"id": old.id})
+        kept = await database.contacts_archive.find_one({"id": recent.id})
+        return (old, recent, unread, new), first, live, archived, stats, looked_up, second, exported, kept
+
+    (old, recent, unread, new), first, live, archived, stats, looked_up, second, exported, kept = asyncio.run(scenario())
+
+    # Only read contacts older than 90 days leave the hot collection
+    assert first == {"archived": 2, "exported": 1}
+    assert live == sorted([unread.id, new.id])
+    assert archived["archived_at"] == NOW
+    assert stats.total == 2 and stats.unread == 1
+    assert [c.id for c in looked_up] == [old.id, recent.id]
+
+    # Only archived contacts older than 365 days go to a cold file, once
+    assert second == {"archived": 0, "exported": 0}
+    assert exported["expires_at"] == NOW + timedelta(days=7)
+    assert "expires_at" not in kept
+    files = list(tmp_path.glob("*.ndjson.zst"))
+    assert [f.name for f in files] == [exported["cold_file"]]
+    lines = zstandard.ZstdDecompressor().decompressobj().decompress(files[0].read_bytes()).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [old.id]
+
+def test_without_cold_dir_nothing_is_marked_for_expiry(database):
+    retention = ContactRetention(database, archive_after=timedelta(days=90), cold_after=timedelta(days=365))
+
+    async def scenario():
+        await seed(database, ContactCounters(database))
+        result = await retention.run(NOW)
+        return result, await database.contacts_archive.count_documents({"expires_at": {"$exists": True}})
+
+    result, expiring = asyncio.run(scenario())
+    assert result == {"archived": 2, "exported": 0}
+    assert expiring == 0
+
+def test_export_includes_archived_contacts(database):
+    service = ContactService(database)
+    retention = ContactRetention(database, archive_after=timedelta(days=90))
+
+    async def scenario():
+        contacts = await seed(database, service.counters)
+        await retention.run(NOW)
+        body = b"".join([chunk async for chunk in service.export_contacts()])
+        return contacts, [json.loads(line) for line in body.splitlines()]
+
+    contacts, exported = asyncio.run(scenario())
+    assert sorted(d["id"] for d in exported) == sorted(c.id for c in contacts)
+    assert sum("archived_at" in d for d in exported) == 2
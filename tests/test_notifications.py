@@ -0,0 +1,143 @@
+import asyncio
+import socket
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from backend.models.contact import Contact
+from backend.services.notifications import NotificationDispatcher, NotificationTarget, SmtpTarget
+
+def make_contact(i: int) -> Contact:
+    return Contact(name="Test", email=f"notify-{i}@example.com", subject=f"Subject {i}", message=f"Message {i}")
+
+class RecordingTarget(NotificationTarget):
+    """Fails the first ``failures`` sends, then records each delivery."""
+
+    name = "recording"
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.attempts = 0
+        self.deliveries = []
+
+    async def send(self, contacts):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError(f"attempt {self.attempts} failed")
+        self.deliveries.append([contact.id for contact in contacts])
+
+class Mailbox:
+    """aiosmtpd handler keeping every message it receives."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(message_from_bytes(envelope.content))
+        return "250 OK"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def dispatch(dispatcher, contacts):
+    dispatcher.start()
+    for contact in contacts:
+        dispatcher.notify(contact)
+    await asyncio.sleep(0.05)  # let the workers take them before stop() cuts digests short
+    await dispatcher.stop()
+
+def test_smtp_delivery(database):
+    mailbox = Mailbox()
+    controller = Controller(mailbox, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        target = SmtpTarget(controller.hostname, "portfolio@example.com", ["owner@example.com"], port=controller.port)
+        dispatcher = NotificationDispatcher([target], database.notification_dead_letters, max_attempts=1)
+        contact = make_contact(0)
+        asyncio.run(dispatch(dispatcher, [contact]))
+    finally:
+        controller.stop()
+
+    [message] = mailbox.messages
+    assert message["Subject"] == "New contact: Subject 0"
+    assert message["Reply-To"] == contact.email
+    assert "Message 0" in message.get_payload()
+
+def test_retry_then_dead_letter(database):
+    flaky = RecordingTarget(failures=2)
+    broken = RecordingTarget(failures=10)
+    broken.name = "broken"
+    dispatcher = NotificationDispatcher([flaky, broken], database.notification_dead_letters, max_attempts=3, retry_delay=0.01)
+    contact = make_contact(0)
+
+    async def scenario():
+        await dispatch(dispatcher, [contact])
+        return await database.notification_dead_letters.find({}, {"_id": 0}).to_list(None)
+
+    dead_letters = asyncio.run(scenario())
+    # Delivered on the third attempt
+    assert flaky.attempts == 3 and flaky.deliveries == [[contact.id]]
+    # Given up after three attempts, with the contact kept for a resend
+    assert broken.attempts == 3 and broken.deliveries == []
+    [dead_letter] = dead_letters
+    assert dead_letter["target"] == "broken"
+    assert dead_letter["attempts"] == 3
+    assert dead_letter["error"] == "attempt 3 failed"
+    assert [c["id"] for c in dead_letter["contacts"]] == [contact.id]
+
+def test_digest_batches_contacts(database):
+    target = RecordingTarget()
+    dispatcher = NotificationDispatcher([target], database.notification_dead_letters, workers=1, digest_size=3, digest_window=0.2)
+    contacts = [make_contact(i) for i in range(5)]
+    ids = [contact.id for contact in contacts]
+
+    asyncio.run(dispatch(dispatcher, contacts))
+    # A full digest straight away, then the rest once the window closes
+    assert target.deliveries == [ids[:3], ids[3:]]
+
+def test_stop_sends_a_partial_digest(database):
+    target = RecordingTarget()
+    dispatcher = NotificationDispatcher([target], database.notification_dead_letters, workers=1, digest_size=10, digest_window=60)
+    contacts = [make_contact(i) for i in range(3)]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await dispatch(dispatcher, contacts)
+        return loop.time() - started
+
+    elapsed = asyncio.run(scenario())
+    assert target.deliveries == [[contact.id for contact in contacts]]
+    assert elapsed < 1
+
+def test_stop_counts_notifications_held_by_workers(database, caplog):
+    class HangingTarget(RecordingTarget):
+        async def send(self, contacts):
+            await asyncio.Event().wait()
+
+    dispatcher = NotificationDispatcher([HangingTarget()], database.notification_dead_letters, workers=1, digest_size=2, digest_window=60)
+
+    async def scenario():
+        dispatcher.start()
+        for i in range(3):
+            dispatcher.notify(make_contact(i))
+        await asyncio.sleep(0.05)
+        await dispatcher.stop(timeout=0.1)
+
+    asyncio.run(scenario())
+    # Two held by the worker in a digest, one still queued
+    assert "3 contact notifications not sent on shutdown" in caplog.text
+
+def test_max_attempts_must_be_positive(database):
+    with pytest.raises(ValueError):
+        NotificationDispatcher([RecordingTarget()], database.notification_dead_letters, max_attempts=0)
+
+def test_targets_must_implement_send():
+    class Incomplete(NotificationTarget):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
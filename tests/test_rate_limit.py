@@ -0,0 +1,23 @@
+from backend.middleware.rate_limit import RateLimitMiddleware
+
+def scope(*forwarded: str) -> dict:
+    return {
+        "type": "http",
+        "headers": [(b"x-forwarded-for", value.encode()) for value in forwarded],
+        "client": ("10.0.0.2", 51000),
+    }
+
+def client_ip(trusted_proxies: int, *forwarded: str) -> str:
+    return RateLimitMiddleware(None, trusted_proxies=trusted_proxies)._client_ip(scope(*forwarded))
+
+def test_forwarded_for_ignored_without_trusted_proxies():
+    assert client_ip(0, "203.0.113.9") == "10.0.0.2"
+
+def test_client_supplied_entries_are_skipped():
+    # The client sent "1.2.3.4"; the proxy appended the address it saw
+    assert client_ip(1, "1.2.3.4, 203.0.113.9") == "203.0.113.9"
+    assert client_ip(2, "1.2.3.4, 203.0.113.9", "10.0.0.1") == "203.0.113.9"
+
+def test_fewer_entries_than_proxies():
+    assert client_ip(2, "203.0.113.9") == "203.0.113.9"
+    assert client_ip(1) == "10.0.0.2"
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from backend.models.project import Project, ProjectUpdate
+from backend.services.project_service import ProjectService
+from backend.services.versioning import VersionConflictError
+
+def legacy_project() -> dict:
+    """A project stored before versioning, without a ``version`` field."""
+    document = Project(
+        title="Legacy",
+        short_description="Stored before versioning",
+        description="Stored before versioning",
+        technologies=["Python"],
+        images=[]
+    ).dict()
+    del document["version"]
+    return document
+
+def test_unconditional_update_advances_a_legacy_version(database):
+    service = ProjectService(database)
+    document = legacy_project()
+
+    async def scenario():
+        await database.projects.insert_one(dict(document))
+        before = await service.get_project(document["id"])
+        after = await service.update_project(document["id"], ProjectUpdate(title="$5 site"))
+        with pytest.raises(VersionConflictError) as conflict:
+            # A client still holding the version it read before the update
+            await service.update_project(document["id"], ProjectUpdate(title="Stale"), expected_version=before.version)
+        return before, after, conflict.value, await service.get_project(document["id"])
+
+    before, after, conflict, stored = asyncio.run(scenario())
+    assert before.version == 1
+    assert after.version == 2 and after.title == "$5 site"
+    assert conflict.current_version == 2
+    assert stored.title == "$5 site"